@@ -3,8 +3,38 @@
 import argparse
 import sys
 
-from .app import run_server
-from .config import CameraConfig, Config, ServerConfig
+from .config import CameraConfig, Config, H264Config, ServerConfig
+
+
+def _monkey_patch(async_mode: str) -> None:
+    """Make blocking stdlib I/O cooperative for a green-thread async mode.
+
+    Must run before Flask, Socket.IO or the camera modules import socket and
+    threading, which is why main() imports the app only after calling this.
+    Without it every MJPEG viewer would block the single hub thread.
+
+    Args:
+        async_mode: Socket.IO async mode from the command line.
+    """
+    if async_mode == "eventlet":
+        import eventlet
+
+        eventlet.monkey_patch()
+    elif async_mode == "gevent":
+        from gevent import monkey
+
+        monkey.patch_all()
+
+
+def _cpu_index(value: str) -> int:
+    """argparse type for a CPU core index (a non-negative integer)."""
+    try:
+        cpu = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid CPU index: {value!r}")
+    if cpu < 0:
+        raise argparse.ArgumentTypeError(f"CPU index must be 0 or greater, got {cpu}")
+    return cpu
 
 
 def main() -> int:
@@ -46,11 +76,52 @@ def main() -> int:
         default=30,
         help="Capture frame rate (default: 30)",
     )
+    parser.add_argument(
+        "--backend",
+        choices=["opencv", "v4l2"],
+        default="opencv",
+        help="Capture backend; v4l2 passes MJPEG frames through (default: opencv)",
+    )
+    parser.add_argument(
+        "--jpeg-passthrough",
+        action="store_true",
+        help="OpenCV backend: pass MJPEG frames through without decoding them",
+    )
+    parser.add_argument(
+        "--capture-cpu",
+        type=_cpu_index,
+        default=None,
+        help="Pin the capture thread to this CPU core (default: no pinning)",
+    )
+    parser.add_argument(
+        "--capture-priority",
+        type=int,
+        default=None,
+        help="SCHED_FIFO priority 1-99 for the capture thread (requires root)",
+    )
+    parser.add_argument(
+        "--encoder-cpu",
+        type=_cpu_index,
+        default=None,
+        help="Pin each H.264 encoder's I/O thread to this CPU core (default: no pinning)",
+    )
+    parser.add_argument(
+        "--encoder-nice",
+        type=int,
+        default=None,
+        help="Nice value for H.264 encoder I/O threads; negative needs root",
+    )
     parser.add_argument(
         "--preview",
         action="store_true",
         help="Enable local preview window",
     )
+    parser.add_argument(
+        "--async-mode",
+        choices=["threading", "eventlet", "gevent"],
+        default="threading",
+        help="Socket.IO async mode (default: threading)",
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -59,17 +130,42 @@ def main() -> int:
 
     args = parser.parse_args()
 
+    if args.async_mode != "threading":
+        # Green threads all run on the server's one OS thread, so pinning or
+        # prioritising "the capture thread" would apply to the whole server
+        tuning = {
+            "--capture-cpu": args.capture_cpu,
+            "--capture-priority": args.capture_priority,
+            "--encoder-cpu": args.encoder_cpu,
+            "--encoder-nice": args.encoder_nice,
+        }
+        used = [flag for flag, value in tuning.items() if value is not None]
+        if used:
+            parser.error(f"{', '.join(used)} require --async-mode threading")
+
+    _monkey_patch(args.async_mode)
+    from .app import run_server
+
     config = Config(
         camera=CameraConfig(
             device=args.device,
             width=args.width,
             height=args.height,
             fps=args.fps,
+            backend=args.backend,
+            jpeg_passthrough=args.jpeg_passthrough,
+            capture_cpu=args.capture_cpu,
+            capture_priority=args.capture_priority,
+        ),
+        h264=H264Config(
+            io_cpu=args.encoder_cpu,
+            io_nice=args.encoder_nice,
         ),
         server=ServerConfig(
             host=args.host,
             port=args.port,
             debug=args.debug,
+            async_mode=args.async_mode,
         ),
         enable_preview=args.preview,
     )
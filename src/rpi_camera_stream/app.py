@@ -1,22 +1,71 @@
 """Flask application factory."""
 
+import dataclasses
+import functools
 import ipaddress
 import logging
 import os
+from typing import Optional
 
 from flask import Flask, redirect, request, url_for
 from flask_socketio import SocketIO
 
-from .camera import FrameBuffer, OpenCVCamera
-from .config import Config
-from .routes import api_bp, mjpeg_bp, settings_bp, www_bp, www_api_bp
+from .camera import Camera, EncodedFrameBuffer, FrameBuffer, create_camera
+from .config import CameraConfig, Config
+from .encoders import MJPEGEncoder
+from .json_provider import OrjsonProvider, orjson
 from .settings import Settings
-from .socketio_handlers import VideoNamespace
 
 logger = logging.getLogger(__name__)
 
 socketio = SocketIO()
-video_namespace = VideoNamespace()
+
+
+# Address prefixes that are always loopback, private or link-local; checked
+# before falling back to the (much slower) ipaddress parse. Only valid
+# dotted-quad addresses take this path.
+_LOCAL_PREFIXES = ("127.", "10.", "192.168.", "169.254.")
+
+
+def _is_dotted_quad(addr: str) -> bool:
+    """Return True if the string is a valid IPv4 address in dotted-quad form."""
+    parts = addr.split(".")
+    return len(parts) == 4 and all(
+        part.isascii() and part.isdigit() and int(part) <= 255
+        and (part == "0" or part[0] != "0")
+        for part in parts
+    )
+
+
+def _first_xff(header: str) -> str:
+    """Return the first (original client) hop of an X-Forwarded-For header."""
+    i = header.find(",")
+    return header.strip() if i < 0 else header[:i].strip()
+
+
+@functools.lru_cache(maxsize=1024)
+def _classify(remote_addr: str) -> bool:
+    """Return True if the address is loopback, private (LAN) or link-local."""
+    try:
+        ip = ipaddress.ip_address(remote_addr)
+
+        # Check if it's a loopback address (localhost)
+        if ip.is_loopback:
+            return True
+
+        # Check if it's a private address (LAN)
+        if ip.is_private:
+            return True
+
+        # Check if it's link-local (fe80::/10 for IPv6, 169.254.0.0/16 for IPv4)
+        if ip.is_link_local:
+            return True
+
+        return False
+
+    except ValueError:
+        # Invalid IP address format, default to remote (secure)
+        return False
 
 
 def is_local_request() -> bool:
@@ -29,13 +78,14 @@ def is_local_request() -> bool:
         True if request is from local network (localhost or LAN), False otherwise.
     """
     # Get the remote address, checking proxy headers first
-    remote_addr = request.headers.get('X-Real-IP')
+    headers = request.headers
+    remote_addr = headers.get('X-Real-IP')
     if not remote_addr:
-        forwarded_for = request.headers.get('X-Forwarded-For')
+        forwarded_for = headers.get('X-Forwarded-For')
         if forwarded_for:
             # X-Forwarded-For can contain multiple IPs: "client, proxy1, proxy2"
             # The first IP is the original client
-            remote_addr = forwarded_for.split(',')[0].strip()
+            remote_addr = _first_xff(forwarded_for)
 
     if not remote_addr:
         remote_addr = request.remote_addr
@@ -44,26 +94,50 @@ def is_local_request() -> bool:
         # No remote address found, default to remote (secure)
         return False
 
-    try:
-        ip = ipaddress.ip_address(remote_addr)
+    if remote_addr == "::1" or (
+        remote_addr.startswith(_LOCAL_PREFIXES) and _is_dotted_quad(remote_addr)
+    ):
+        return True
 
-        # Check if it's a loopback address (localhost)
-        if ip.is_loopback:
-            return True
+    return _classify(remote_addr)
 
-        # Check if it's a private address (LAN)
-        if ip.is_private:
-            return True
 
-        # Check if it's link-local (fe80::/10 for IPv6, 169.254.0.0/16 for IPv4)
-        if ip.is_link_local:
-            return True
+@functools.lru_cache(maxsize=8)
+def _select_camera_config(
+    config: CameraConfig,
+    active_slot: Optional[int],
+    cameras: tuple[tuple[int, str, bool], ...],
+) -> tuple[CameraConfig, Optional[int]]:
+    """Pick the camera device to start with from the saved camera slots.
 
-        return False
+    This is a pure function of its (hashable) arguments and is cached on
+    them, so rebuilding the app with unchanged settings skips the scan. It
+    does not log, since cache hits would skip the messages; the caller
+    reports the decision. ``Settings.camera_slots`` provides the camera
+    tuple.
 
-    except ValueError:
-        # Invalid IP address format, default to remote (secure)
-        return False
+    Args:
+        config: Base camera configuration.
+        active_slot: The saved ``active_camera_slot`` setting.
+        cameras: ``(slot, device, enabled)`` for each camera slot.
+
+    Returns:
+        Tuple of (camera config, slot). The slot is ``active_slot`` if it is
+        usable, otherwise the first enabled slot (which the caller persists
+        as the new active slot), or None if no slot is usable.
+    """
+    if active_slot and cameras and active_slot <= len(cameras):
+        _, device, enabled = cameras[active_slot - 1]
+        if enabled and device:
+            # Use the configured device for the active slot
+            return dataclasses.replace(config, device=device), active_slot
+
+    # If no active camera is set, try to start the first enabled camera
+    for slot, device, enabled in cameras:
+        if enabled and device:
+            return dataclasses.replace(config, device=device), slot
+
+    return config, None
 
 
 def create_app(config: Config = None) -> Flask:
@@ -80,6 +154,8 @@ def create_app(config: Config = None) -> Flask:
 
     app = Flask(__name__)
     app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY", "dev-secret-key")
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
 
     template_dir = os.path.join(os.path.dirname(__file__), "templates")
     app.template_folder = template_dir
@@ -92,6 +168,8 @@ def create_app(config: Config = None) -> Flask:
     run_startup_tasks(settings)
 
     frame_buffer = FrameBuffer()
+    encoded_buffer = EncodedFrameBuffer()
+    mjpeg_encoder = MJPEGEncoder(frame_buffer, encoded_buffer)
 
     # Check if there's an active camera slot configured
     active_slot = settings.get("active_camera_slot")
@@ -99,29 +177,26 @@ def create_app(config: Config = None) -> Flask:
 
     logger.info(f"Startup: active_camera_slot = {active_slot}, cameras = {cameras}")
 
-    camera_started = False
-    if active_slot and cameras and active_slot <= len(cameras):
-        camera_config = cameras[active_slot - 1]
-        logger.info(f"Checking slot {active_slot}: enabled={camera_config.get('enabled')}, device={camera_config.get('device')}")
-        if camera_config.get("enabled") and camera_config.get("device"):
-            # Use the configured device for the active slot
-            config.camera.device = camera_config["device"]
-            logger.info(f"Starting with configured camera: Slot {active_slot} on {camera_config['device']}")
-            camera_started = True
-        else:
-            logger.warning(f"Slot {active_slot} is not properly configured (enabled={camera_config.get('enabled')}, device={camera_config.get('device')})")
-
-    # If no active camera is set, try to start the first enabled camera
-    if not camera_started and cameras:
-        logger.info("No active camera started yet, looking for first enabled camera...")
-        for cam_config in cameras:
-            if cam_config.get("enabled") and cam_config.get("device"):
-                config.camera.device = cam_config["device"]
-                settings.set("active_camera_slot", cam_config["slot"])
-                logger.info(f"No active camera set. Starting first enabled camera: Slot {cam_config['slot']} on {cam_config['device']}")
-                break
-
-    camera = OpenCVCamera(config.camera, frame_buffer)
+    camera_slots = settings.camera_slots
+    camera_config, slot = _select_camera_config(config.camera, active_slot, camera_slots)
+    if slot is not None and slot == active_slot:
+        logger.info(f"Starting with configured camera: Slot {slot} on {camera_config.device}")
+    else:
+        if active_slot and camera_slots and active_slot <= len(camera_slots):
+            _, device, enabled = camera_slots[active_slot - 1]
+            logger.warning(
+                f"Slot {active_slot} is not properly configured "
+                f"(enabled={enabled}, device={device})"
+            )
+        if slot is not None:
+            logger.info(
+                f"No active camera set. Starting first enabled camera: "
+                f"Slot {slot} on {camera_config.device}"
+            )
+            settings.set("active_camera_slot", slot)
+    config = dataclasses.replace(config, camera=camera_config)
+
+    camera = create_camera(config.camera, frame_buffer)
 
     # Initialize robot device if enabled
     robot_device = None
@@ -132,7 +207,9 @@ def create_app(config: Config = None) -> Flask:
         robot_device = RobotSerialDevice(
             port=robot_config.get("port", "/dev/ttyUSB0"),
             baud_rate=robot_config.get("baud_rate", 115200),
-            timeout=robot_config.get("timeout", 1.0)
+            timeout=robot_config.get("timeout", 1.0),
+            batch_size=robot_config.get("batch_size", 1),
+            max_batch_delay=robot_config.get("max_batch_delay", 0.05),
         )
 
         # Auto-connect if configured
@@ -143,10 +220,24 @@ def create_app(config: Config = None) -> Flask:
                 logger.warning("Failed to auto-connect robot device")
 
     app.config["frame_buffer"] = frame_buffer
+    app.config["encoded_buffer"] = encoded_buffer
+    app.config["mjpeg_encoder"] = mjpeg_encoder
     app.config["camera"] = camera
     app.config["app_config"] = config
     app.config["settings"] = settings
     app.config["robot_device"] = robot_device
+    # Resolved once here; root_path is src/rpi_camera_stream, so two levels up
+    # is the project root. Kept as a str since routes only join file names.
+    app.config["snapshots_dir"] = os.path.join(
+        os.path.dirname(os.path.dirname(app.root_path)), "snapshots"
+    )
+    # slot -> (jpeg, etag) for snapshots saved since startup
+    app.config["latest_snapshots"] = {}
+
+    # Blueprints and the Socket.IO namespace are imported here rather than at
+    # module level so importing the package stays cheap until an app is built.
+    from .routes import api_bp, mjpeg_bp, settings_bp, www_bp, www_api_bp
+    from .socketio_handlers import VideoNamespace
 
     app.register_blueprint(api_bp)
     app.register_blueprint(mjpeg_bp)
@@ -185,17 +276,66 @@ def create_app(config: Config = None) -> Flask:
 
     socketio.init_app(
         app,
-        async_mode="eventlet",
+        async_mode=config.server.async_mode,
         cors_allowed_origins=config.server.cors_origins,
     )
+    video_namespace = VideoNamespace()
     socketio.on_namespace(video_namespace)
+    app.config["video_namespace"] = video_namespace
 
     return app
 
 
+def start_capture(app: Flask, config: Config) -> None:
+    """Start the camera, the shared MJPEG encoder and the optional preview.
+
+    Args:
+        app: Application returned by create_app().
+        config: Configuration the app was created with.
+    """
+    camera: Camera = app.config["camera"]
+
+    if not camera.start():
+        logger.warning("Camera not available - server will start without video capture")
+
+    mjpeg_encoder: MJPEGEncoder = app.config["mjpeg_encoder"]
+    mjpeg_encoder.start()
+
+    if config.enable_preview:
+        from .preview import LocalDisplay
+        preview = LocalDisplay(app.config["frame_buffer"])
+        preview.start()
+        app.config["preview"] = preview
+
+
+def stop_capture(app: Flask, config: Config) -> None:
+    """Stop everything start_capture() started and save pending settings.
+
+    Args:
+        app: Application returned by create_app().
+        config: Configuration the app was created with.
+    """
+    app.config["video_namespace"].cleanup_all()
+    app.config["mjpeg_encoder"].stop()
+    app.config["camera"].stop()
+    if config.enable_preview and "preview" in app.config:
+        app.config["preview"].stop()
+    # Disconnect robot device if connected
+    robot_device = app.config.get("robot_device")
+    if robot_device and robot_device.is_connected():
+        robot_device.disconnect()
+    # Persist any settings change still waiting for the debounced write
+    app.config["settings"].flush()
+
+
 def run_server(config: Config = None) -> None:
     """Run the streaming server.
 
+    Serves with Socket.IO's built-in server for the async mode. In threading
+    mode that is the Werkzeug development server, which is only allowed in
+    debug mode; run production deployments under gunicorn via
+    ``rpi_camera_stream.wsgi:app`` instead.
+
     Args:
         config: Application configuration. Uses defaults if None.
     """
@@ -208,16 +348,7 @@ def run_server(config: Config = None) -> None:
     )
 
     app = create_app(config)
-    camera: OpenCVCamera = app.config["camera"]
-
-    if not camera.start():
-        logger.warning("Camera not available - server will start without video capture")
-
-    if config.enable_preview:
-        from .preview import LocalDisplay
-        preview = LocalDisplay(app.config["frame_buffer"])
-        preview.start()
-        app.config["preview"] = preview
+    start_capture(app, config)
 
     try:
         logger.info(f"Starting server on {config.server.host}:{config.server.port}")
@@ -227,13 +358,10 @@ def run_server(config: Config = None) -> None:
             port=config.server.port,
             debug=config.server.debug,
             use_reloader=False,
+            # Threading mode serves through the Werkzeug development server,
+            # which Flask-SocketIO refuses to run outside a terminal unless
+            # allowed; only allow it for debugging.
+            allow_unsafe_werkzeug=config.server.debug,
         )
     finally:
-        video_namespace.cleanup_all()
-        camera.stop()
-        if config.enable_preview and "preview" in app.config:
-            app.config["preview"].stop()
-        # Disconnect robot device if connected
-        robot_device = app.config.get("robot_device")
-        if robot_device and robot_device.is_connected():
-            robot_device.disconnect()
+        stop_capture(app, config)
@@ -1,6 +1,16 @@
 """Camera capture module."""
 
+from .encoded_buffer import EncodedFrameBuffer
+from .factory import Camera, create_camera
 from .frame_buffer import FrameBuffer
 from .opencv_capture import OpenCVCamera
+from .v4l2_mjpeg import V4L2MJPEGCamera
 
-__all__ = ["FrameBuffer", "OpenCVCamera"]
+__all__ = [
+    "Camera",
+    "EncodedFrameBuffer",
+    "FrameBuffer",
+    "OpenCVCamera",
+    "V4L2MJPEGCamera",
+    "create_camera",
+]
@@ -0,0 +1,99 @@
+"""Thread-safe buffer for sharing the latest JPEG-encoded frame."""
+
+import threading
+from typing import Optional
+
+
+class EncodedFrameBuffer:
+    """Thread-safe buffer holding the latest JPEG-encoded frame.
+
+    Encoded frames are immutable ``bytes``, so any number of MJPEG clients can
+    stream the same frame without copying or re-encoding it. Each new frame
+    bumps a sequence number that clients use to wait for the next one.
+
+    Clients register with :meth:`subscribe` while streaming so the encoder can
+    skip encoding entirely when nobody is watching.
+    """
+
+    def __init__(self):
+        self._jpeg: Optional[bytes] = None
+        self._seq = 0
+        self._subscriber_count = 0
+        self._cond = threading.Condition()
+
+    def put(self, jpeg: bytes) -> None:
+        """Publish a new encoded frame and wake waiting clients."""
+        with self._cond:
+            self._jpeg = jpeg
+            self._seq += 1
+            self._cond.notify_all()
+
+    def get(
+        self, last_seq: int = 0, timeout: Optional[float] = None
+    ) -> tuple[Optional[bytes], int]:
+        """Wait for an encoded frame newer than the one the caller last saw.
+
+        Args:
+            last_seq: Sequence number returned with the caller's last frame
+                (0 if it has not seen one yet).
+            timeout: Maximum time to wait for a new frame (seconds).
+
+        Returns:
+            Tuple of (jpeg_data, seq). jpeg_data is None if no new frame
+            arrived before the timeout expired.
+        """
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._jpeg is not None and self._seq != last_seq,
+                timeout=timeout,
+            ):
+                return None, last_seq
+            return self._jpeg, self._seq
+
+    def get_nowait(self) -> Optional[bytes]:
+        """Get the latest encoded frame without waiting."""
+        with self._cond:
+            return self._jpeg
+
+    def subscribe(self) -> int:
+        """Register a streaming client.
+
+        Returns:
+            The current sequence number, so the client's first :meth:`get`
+            waits for a freshly encoded frame instead of a stale one.
+        """
+        with self._cond:
+            self._subscriber_count += 1
+            self._cond.notify_all()
+            return self._seq
+
+    def unsubscribe(self) -> None:
+        """Unregister a streaming client."""
+        with self._cond:
+            self._subscriber_count = max(0, self._subscriber_count - 1)
+
+    def wait_for_subscribers(self, timeout: Optional[float] = None) -> bool:
+        """Wait until at least one client is subscribed.
+
+        Returns:
+            True if a client is subscribed, False if the timeout expired.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self._subscriber_count > 0, timeout=timeout)
+
+    @property
+    def subscriber_count(self) -> int:
+        """Return the number of subscribed streaming clients."""
+        with self._cond:
+            return self._subscriber_count
+
+    @property
+    def seq(self) -> int:
+        """Return the sequence number of the latest encoded frame."""
+        with self._cond:
+            return self._seq
+
+    def clear(self) -> None:
+        """Clear the buffer."""
+        with self._cond:
+            self._jpeg = None
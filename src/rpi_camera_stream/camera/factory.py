@@ -0,0 +1,30 @@
+"""Construct the configured camera capture backend."""
+
+from typing import Union
+
+from ..config import CameraConfig
+from .frame_buffer import FrameBuffer
+from .opencv_capture import OpenCVCamera
+from .v4l2_mjpeg import V4L2MJPEGCamera
+
+Camera = Union[OpenCVCamera, V4L2MJPEGCamera]
+
+
+def create_camera(config: CameraConfig, frame_buffer: FrameBuffer) -> Camera:
+    """Create a camera for ``config.backend``.
+
+    Args:
+        config: Camera configuration.
+        frame_buffer: Buffer the camera publishes frames to.
+
+    Returns:
+        An unstarted camera instance.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    if config.backend == "opencv":
+        return OpenCVCamera(config, frame_buffer)
+    if config.backend == "v4l2":
+        return V4L2MJPEGCamera(config, frame_buffer)
+    raise ValueError(f"Unknown camera backend: {config.backend}")
@@ -3,24 +3,132 @@
 import threading
 from typing import Optional
 
+import cv2
 import numpy as np
 
+DEFAULT_RING_SIZE = 3
+
 
 class FrameBuffer:
-    """Thread-safe buffer for sharing the latest camera frame."""
+    """Thread-safe buffer for sharing the latest camera frame.
+
+    Frames are stored in a small ring of pre-allocated slots. The producer
+    fills the slot at the head of the ring and publishes it as the latest
+    frame; when the ring is full the oldest slot is overwritten, so live
+    video always favours the newest frame. Keeping more than two slots gives
+    slow consumers (JPEG/H.264 encoders) a full frame period of slack before
+    the slot they are reading is reused.
+
+    Readers get a non-writable view of the published slot rather than a
+    copy, so frames returned by :meth:`get` and :meth:`get_nowait` cost no
+    memcpy and an accidental in-place edit raises instead of corrupting the
+    shared frame. Use :meth:`get_copy` when the frame needs to be modified.
 
-    def __init__(self):
-        self._frame: Optional[np.ndarray] = None
-        self._lock = threading.Lock()
-        self._frame_available = threading.Event()
-        self._frame_count = 0
+    The latest frame is published as a single immutable tuple that is swapped
+    in one assignment, so non-blocking reads never take the lock and readers
+    never wait on each other; only the blocking waits use the condition.
+
+    Cameras that deliver compressed frames publish them with :meth:`put_jpeg`.
+    Such frames are only decoded to BGR when a reader asks for an array, and
+    at most once per frame; MJPEG consumers read the original bytes with
+    :meth:`get_jpeg_nowait` instead.
+    """
+
+    def __init__(self, size: int = DEFAULT_RING_SIZE):
+        if size < 2:
+            raise ValueError("FrameBuffer needs at least 2 slots")
+        self._ring: list[Optional[np.ndarray]] = [None] * size
+        # Read-only views of the ring slots, handed out to readers
+        self._views: list[Optional[np.ndarray]] = [None] * size
+        self._head = 0
+        self._cond = threading.Condition(threading.Lock())
+        # (ring index, frame count, JPEG bytes) of the latest frame. The index
+        # is -1 until a raw frame is committed; the JPEG bytes are set only
+        # when the latest frame was published via put_jpeg().
+        self._published: tuple[int, int, Optional[bytes]] = (-1, 0, None)
+        self._decoded: tuple[int, Optional[np.ndarray]] = (0, None)
+        self._decode_lock = threading.Lock()
 
     def put(self, frame: np.ndarray) -> None:
-        """Store a new frame in the buffer."""
-        with self._lock:
-            self._frame = frame.copy()
-            self._frame_count += 1
-        self._frame_available.set()
+        """Store a new frame in the buffer, taking ownership of it.
+
+        The array becomes a ring slot without being copied, so the caller
+        must not modify or reuse it afterwards. Use :meth:`put_copy` for
+        frames whose memory the caller keeps using.
+        """
+        self._ring[self._head] = frame
+        self.commit()
+
+    def put_copy(self, frame: np.ndarray) -> None:
+        """Store a copy of a frame the caller keeps ownership of."""
+        back = self.put_into_back(frame.shape, frame.dtype)
+        np.copyto(back, frame)
+        self.commit()
+
+    def put_into_back(self, shape: tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """Return the writable back slot so the producer can fill it in place.
+
+        The caller must call :meth:`commit` once the slot has been filled to
+        publish it as the latest frame.
+
+        Args:
+            shape: Shape of the frame that will be written.
+            dtype: Data type of the frame that will be written.
+
+        Returns:
+            The back slot array.
+        """
+        # Only the producer thread writes, so the head slot can be filled
+        # outside the lock; it is never the slot readers are handed.
+        slot = self._ring[self._head]
+        if slot is None or slot.shape != tuple(shape) or slot.dtype != dtype:
+            slot = np.empty(shape, dtype=dtype)
+            self._ring[self._head] = slot
+        return slot
+
+    def commit(self) -> None:
+        """Publish the back slot filled via :meth:`put_into_back`."""
+        # Slots are mostly reused, so the view is only rebuilt when the
+        # slot array itself was replaced
+        slot = self._ring[self._head]
+        view = self._views[self._head]
+        if view is None or view.base is not slot:
+            view = slot.view()
+            view.flags.writeable = False
+            self._views[self._head] = view
+
+        with self._cond:
+            self._published = (self._head, self._published[1] + 1, None)
+            self._head = (self._head + 1) % len(self._ring)
+            self._cond.notify_all()
+
+    def put_jpeg(self, jpeg: bytes) -> None:
+        """Publish a frame that is already JPEG-encoded.
+
+        Args:
+            jpeg: Complete JPEG image bytes.
+        """
+        with self._cond:
+            idx, count, _ = self._published
+            self._published = (idx, count + 1, jpeg)
+            self._cond.notify_all()
+
+    def _has_frame(self) -> bool:
+        idx, _, jpeg = self._published
+        return idx >= 0 or jpeg is not None
+
+    def _resolve(self, idx: int, count: int, jpeg: Optional[bytes]) -> Optional[np.ndarray]:
+        """Return the array for a published frame, decoding JPEG frames once."""
+        if jpeg is None:
+            return self._views[idx] if idx >= 0 else None
+        with self._decode_lock:
+            decoded_count, frame = self._decoded
+            if decoded_count != count:
+                frame = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+                if frame is not None:
+                    frame.flags.writeable = False
+                self._decoded = (count, frame)
+            return frame
 
     def get(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
         """Get the latest frame from the buffer.
@@ -29,26 +137,79 @@ class FrameBuffer:
             timeout: Maximum time to wait for a frame (seconds).
 
         Returns:
-            The latest frame, or None if timeout expires.
+            The latest frame (read-only), or None if timeout expires.
         """
-        if not self._frame_available.wait(timeout=timeout):
-            return None
-        with self._lock:
-            return self._frame.copy() if self._frame is not None else None
+        with self._cond:
+            if not self._cond.wait_for(self._has_frame, timeout=timeout):
+                return None
+        return self._resolve(*self._published)
+
+    def get_next(
+        self, last_count: int, timeout: Optional[float] = None
+    ) -> tuple[Optional[np.ndarray], int]:
+        """Wait for a frame newer than the one the caller last saw.
+
+        Args:
+            last_count: ``frame_count`` returned with the caller's last frame
+                (0 if it has not seen one yet).
+            timeout: Maximum time to wait for a new frame (seconds).
+
+        Returns:
+            Tuple of (frame, frame_count). The frame is read-only, or None if
+            no new frame arrived before the timeout expired.
+        """
+        count = self.wait_next(last_count, timeout)
+        if count == last_count:
+            return None, last_count
+        idx, count, jpeg = self._published
+        return self._resolve(idx, count, jpeg), count
+
+    def wait_next(self, last_count: int, timeout: Optional[float] = None) -> int:
+        """Wait for a frame newer than ``last_count`` without fetching it.
+
+        Args:
+            last_count: ``frame_count`` of the caller's last frame.
+            timeout: Maximum time to wait for a new frame (seconds).
+
+        Returns:
+            The new frame count, or ``last_count`` if the timeout expired.
+        """
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._has_frame() and self._published[1] != last_count,
+                timeout=timeout,
+            ):
+                return last_count
+            return self._published[1]
 
     def get_nowait(self) -> Optional[np.ndarray]:
-        """Get the latest frame without waiting."""
-        with self._lock:
-            return self._frame.copy() if self._frame is not None else None
+        """Get the latest frame without waiting.
+
+        Returns:
+            The latest frame (read-only), or None if no frame is available.
+        """
+        return self._resolve(*self._published)
+
+    def get_jpeg_nowait(self) -> Optional[bytes]:
+        """Get the latest frame's JPEG bytes, if it was published encoded.
+
+        Returns:
+            JPEG bytes, or None if the latest frame is a raw array (or there
+            is no frame yet).
+        """
+        return self._published[2]
+
+    def get_copy(self) -> Optional[np.ndarray]:
+        """Get a private copy of the latest frame that may be modified."""
+        frame = self.get_nowait()
+        return frame.copy() if frame is not None else None
 
     @property
     def frame_count(self) -> int:
         """Return the total number of frames captured."""
-        with self._lock:
-            return self._frame_count
+        return self._published[1]
 
     def clear(self) -> None:
         """Clear the buffer."""
-        with self._lock:
-            self._frame = None
-        self._frame_available.clear()
+        with self._cond:
+            self._published = (-1, self._published[1], None)
@@ -8,10 +8,21 @@ import cv2
 import numpy as np
 
 from ..config import CameraConfig
+from ..utils import run_blocking, tune_current_thread
 from .frame_buffer import FrameBuffer
 
 logger = logging.getLogger(__name__)
 
+_FOURCC_CACHE: dict[str, int] = {}
+
+
+def _fourcc(code: str) -> int:
+    """Return the FOURCC integer for a four-character code (cached)."""
+    value = _FOURCC_CACHE.get(code)
+    if value is None:
+        value = _FOURCC_CACHE[code] = cv2.VideoWriter_fourcc(*code)
+    return value
+
 
 class OpenCVCamera:
     """Camera capture using OpenCV with V4L2 backend."""
@@ -22,7 +33,15 @@ class OpenCVCamera:
         self._capture: Optional[cv2.VideoCapture] = None
         self._running = False
         self._thread: Optional[threading.Thread] = None
-        self._on_frame_callbacks: list[Callable[[np.ndarray], None]] = []
+        self._frame_shape: tuple[int, int, int] = (config.height, config.width, 3)
+        self._jpeg_passthrough = False
+        # Negotiated format, read back from the device once in start(); the
+        # device is not reconfigured while open, so it stays valid until stop().
+        self._properties: dict = {}
+        # Replaced wholesale under the lock so the capture loop can iterate a
+        # snapshot without locking on every frame.
+        self._callbacks: tuple[Callable[[np.ndarray], None], ...] = ()
+        self._callbacks_lock = threading.Lock()
 
     def start(self) -> bool:
         """Start the camera capture thread.
@@ -34,15 +53,11 @@ class OpenCVCamera:
             logger.warning("Camera already running")
             return True
 
-        self._capture = cv2.VideoCapture(self.config.device, cv2.CAP_V4L2)
-        if not self._capture.isOpened():
+        self._capture = self._open()
+        if self._capture is None:
             logger.error(f"Failed to open camera: {self.config.device}")
             return False
 
-        fourcc = cv2.VideoWriter_fourcc(*self.config.fourcc)
-        self._capture.set(cv2.CAP_PROP_FOURCC, fourcc)
-        self._capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.config.width)
-        self._capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self.config.height)
         self._capture.set(cv2.CAP_PROP_FPS, self.config.fps)
 
         actual_width = int(self._capture.get(cv2.CAP_PROP_FRAME_WIDTH))
@@ -53,11 +68,57 @@ class OpenCVCamera:
             f"Camera opened: {actual_width}x{actual_height} @ {actual_fps:.1f} fps"
         )
 
+        # Frames are decoded straight into the frame buffer's back slot
+        self._frame_shape = (actual_height, actual_width, 3)
+        self._properties = {
+            "width": actual_width,
+            "height": actual_height,
+            "fps": actual_fps,
+            "fourcc": self.config.fourcc,
+        }
+
+        # With MJPG and RGB conversion off, V4L2 read() returns the camera's
+        # JPEG bitstream untouched; decoding then only happens on demand.
+        self._jpeg_passthrough = False
+        if self.config.jpeg_passthrough and self.config.fourcc == "MJPG":
+            self._jpeg_passthrough = bool(self._capture.set(cv2.CAP_PROP_CONVERT_RGB, 0))
+
         self._running = True
-        self._thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._thread = threading.Thread(
+            target=self._capture_loop, name="camera-capture", daemon=True
+        )
         self._thread.start()
         return True
 
+    def _open(self) -> Optional[cv2.VideoCapture]:
+        """Open the device with format and size applied as open parameters.
+
+        Passing them to the constructor lets the V4L2 backend configure the
+        device once while opening instead of renegotiating after each
+        ``set()``. Falls back to setting them individually on OpenCV builds
+        whose backend rejects open parameters.
+        """
+        fourcc = _fourcc(self.config.fourcc)
+        capture = cv2.VideoCapture(
+            self.config.device,
+            cv2.CAP_V4L2,
+            [
+                cv2.CAP_PROP_FOURCC, fourcc,
+                cv2.CAP_PROP_FRAME_WIDTH, self.config.width,
+                cv2.CAP_PROP_FRAME_HEIGHT, self.config.height,
+            ],
+        )
+        if capture.isOpened():
+            return capture
+
+        capture = cv2.VideoCapture(self.config.device, cv2.CAP_V4L2)
+        if not capture.isOpened():
+            return None
+        capture.set(cv2.CAP_PROP_FOURCC, fourcc)
+        capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.config.width)
+        capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self.config.height)
+        return capture
+
     def stop(self) -> None:
         """Stop the camera capture."""
         self._running = False
@@ -67,31 +128,81 @@ class OpenCVCamera:
         if self._capture is not None:
             self._capture.release()
             self._capture = None
+        self._properties = {}
         logger.info("Camera stopped")
 
     def add_frame_callback(self, callback: Callable[[np.ndarray], None]) -> None:
-        """Add a callback to be called for each captured frame."""
-        self._on_frame_callbacks.append(callback)
+        """Add a callback to be called for each captured frame.
+
+        The frame passed to the callback is the frame buffer's published slot.
+        It must not be modified, and its memory is reused for later frames, so
+        callbacks that keep a frame beyond the call should copy it.
+        """
+        with self._callbacks_lock:
+            self._callbacks = self._callbacks + (callback,)
 
     def remove_frame_callback(self, callback: Callable[[np.ndarray], None]) -> None:
         """Remove a frame callback."""
-        if callback in self._on_frame_callbacks:
-            self._on_frame_callbacks.remove(callback)
+        with self._callbacks_lock:
+            self._callbacks = tuple(cb for cb in self._callbacks if cb != callback)
 
     def _capture_loop(self) -> None:
         """Main capture loop running in a separate thread."""
+        tune_current_thread(self.config.capture_cpu, self.config.capture_priority)
         while self._running:
             if self._capture is None:
                 break
 
-            ret, frame = self._capture.read()
+            if self._jpeg_passthrough:
+                self._capture_jpeg()
+                continue
+
+            back = self.frame_buffer.put_into_back(self._frame_shape)
+            # A blocking native call; under eventlet/gevent it runs on the
+            # hub's thread pool so it doesn't stall every client
+            ret, frame = run_blocking(self._capture.read, back)
             if not ret:
                 logger.warning("Failed to read frame from camera")
                 continue
 
-            self.frame_buffer.put(frame)
+            if frame is back:
+                self.frame_buffer.commit()
+            else:
+                # Driver delivered a different size than negotiated, so OpenCV
+                # allocated a new array; hand it to the buffer without copying
+                # and adopt its shape for the next read.
+                self._frame_shape = frame.shape
+                self.frame_buffer.put(frame)
 
-            for callback in self._on_frame_callbacks:
+            for callback in self._callbacks:
+                try:
+                    callback(frame)
+                except Exception as e:
+                    logger.error(f"Frame callback error: {e}")
+
+    def _capture_jpeg(self) -> None:
+        """Read one raw MJPEG frame and publish its bytes."""
+        ret, buf = run_blocking(self._capture.read)
+        if not ret:
+            logger.warning("Failed to read frame from camera")
+            return
+
+        if buf.ndim == 3 or buf.size < 2 or buf.flat[0] != 0xFF or buf.flat[1] != 0xD8:
+            # The backend ignored CONVERT_RGB and decoded the frame anyway
+            logger.info("Camera returned decoded frames; JPEG passthrough disabled")
+            self._jpeg_passthrough = False
+            self._frame_shape = buf.shape
+            self.frame_buffer.put(buf)
+        else:
+            self.frame_buffer.put_jpeg(buf.tobytes())
+
+        callbacks = self._callbacks
+        if callbacks:
+            # Decodes the JPEG; off the hub thread under eventlet/gevent
+            frame = run_blocking(self.frame_buffer.get_nowait)
+            if frame is None:
+                return
+            for callback in callbacks:
                 try:
                     callback(frame)
                 except Exception as e:
@@ -109,11 +220,4 @@ class OpenCVCamera:
 
     def get_properties(self) -> dict:
         """Get current camera properties."""
-        if self._capture is None:
-            return {}
-        return {
-            "width": int(self._capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
-            "height": int(self._capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
-            "fps": self._capture.get(cv2.CAP_PROP_FPS),
-            "fourcc": self.config.fourcc,
-        }
+        return dict(self._properties)
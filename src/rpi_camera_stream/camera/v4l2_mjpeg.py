@@ -0,0 +1,391 @@
+"""Direct V4L2 MJPEG capture using memory-mapped driver buffers.
+
+UVC cameras running in MJPG mode already deliver complete JPEG images. This
+capture reads them straight from the driver with the V4L2 streaming I/O
+ioctls and publishes the bytes as-is, skipping OpenCV's JPEG to BGR decode
+and the MJPEG encoder's BGR to JPEG re-encode. Frames are only decoded when
+something asks the frame buffer for an array (H.264 encoding, preview,
+frame callbacks).
+"""
+
+import ctypes
+import errno
+import fcntl
+import logging
+import mmap
+import os
+import select
+import threading
+from typing import Callable, Optional
+
+import numpy as np
+
+from ..config import CameraConfig
+from ..utils import run_blocking, tune_current_thread
+from .frame_buffer import FrameBuffer
+
+logger = logging.getLogger(__name__)
+
+# Number of driver buffers to queue; enough to absorb scheduling jitter
+# without adding noticeable latency.
+BUFFER_COUNT = 4
+
+# ioctl request encoding (asm-generic/ioctl.h)
+_IOC_WRITE = 1
+_IOC_READ = 2
+
+
+def _ioc(direction: int, nr: int, struct) -> int:
+    return (direction << 30) | (ctypes.sizeof(struct) << 16) | (ord("V") << 8) | nr
+
+
+def _fourcc(code: str) -> int:
+    return ord(code[0]) | ord(code[1]) << 8 | ord(code[2]) << 16 | ord(code[3]) << 24
+
+
+V4L2_BUF_TYPE_VIDEO_CAPTURE = 1
+V4L2_MEMORY_MMAP = 1
+V4L2_FIELD_ANY = 0
+V4L2_BUF_FLAG_ERROR = 0x40
+V4L2_PIX_FMT_MJPEG = _fourcc("MJPG")
+
+
+class _PixFormat(ctypes.Structure):
+    _fields_ = [
+        ("width", ctypes.c_uint32),
+        ("height", ctypes.c_uint32),
+        ("pixelformat", ctypes.c_uint32),
+        ("field", ctypes.c_uint32),
+        ("bytesperline", ctypes.c_uint32),
+        ("sizeimage", ctypes.c_uint32),
+        ("colorspace", ctypes.c_uint32),
+        ("priv", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("ycbcr_enc", ctypes.c_uint32),
+        ("quantization", ctypes.c_uint32),
+        ("xfer_func", ctypes.c_uint32),
+    ]
+
+
+class _FormatUnion(ctypes.Union):
+    # The kernel union contains pointers (struct v4l2_window), which gives it
+    # pointer alignment; the c_void_p member reproduces that.
+    _fields_ = [
+        ("pix", _PixFormat),
+        ("raw_data", ctypes.c_uint8 * 200),
+        ("_align", ctypes.c_void_p),
+    ]
+
+
+class _Format(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_uint32), ("fmt", _FormatUnion)]
+
+
+class _RequestBuffers(ctypes.Structure):
+    _fields_ = [
+        ("count", ctypes.c_uint32),
+        ("type", ctypes.c_uint32),
+        ("memory", ctypes.c_uint32),
+        ("capabilities", ctypes.c_uint32),
+        ("reserved", ctypes.c_uint32),
+    ]
+
+
+class _Timeval(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_long), ("tv_usec", ctypes.c_long)]
+
+
+class _Timecode(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("frames", ctypes.c_uint8),
+        ("seconds", ctypes.c_uint8),
+        ("minutes", ctypes.c_uint8),
+        ("hours", ctypes.c_uint8),
+        ("userbits", ctypes.c_uint8 * 4),
+    ]
+
+
+class _BufferM(ctypes.Union):
+    _fields_ = [
+        ("offset", ctypes.c_uint32),
+        ("userptr", ctypes.c_ulong),
+        ("planes", ctypes.c_void_p),
+        ("fd", ctypes.c_int32),
+    ]
+
+
+class _Buffer(ctypes.Structure):
+    _fields_ = [
+        ("index", ctypes.c_uint32),
+        ("type", ctypes.c_uint32),
+        ("bytesused", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("field", ctypes.c_uint32),
+        ("timestamp", _Timeval),
+        ("timecode", _Timecode),
+        ("sequence", ctypes.c_uint32),
+        ("memory", ctypes.c_uint32),
+        ("m", _BufferM),
+        ("length", ctypes.c_uint32),
+        ("reserved2", ctypes.c_uint32),
+        ("request_fd", ctypes.c_int32),
+    ]
+
+
+class _Fract(ctypes.Structure):
+    _fields_ = [("numerator", ctypes.c_uint32), ("denominator", ctypes.c_uint32)]
+
+
+class _CaptureParm(ctypes.Structure):
+    _fields_ = [
+        ("capability", ctypes.c_uint32),
+        ("capturemode", ctypes.c_uint32),
+        ("timeperframe", _Fract),
+        ("extendedmode", ctypes.c_uint32),
+        ("readbuffers", ctypes.c_uint32),
+        ("reserved", ctypes.c_uint32 * 4),
+    ]
+
+
+class _StreamParmUnion(ctypes.Union):
+    _fields_ = [("capture", _CaptureParm), ("raw_data", ctypes.c_uint8 * 200)]
+
+
+class _StreamParm(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_uint32), ("parm", _StreamParmUnion)]
+
+
+VIDIOC_S_FMT = _ioc(_IOC_READ | _IOC_WRITE, 5, _Format)
+VIDIOC_REQBUFS = _ioc(_IOC_READ | _IOC_WRITE, 8, _RequestBuffers)
+VIDIOC_QUERYBUF = _ioc(_IOC_READ | _IOC_WRITE, 9, _Buffer)
+VIDIOC_QBUF = _ioc(_IOC_READ | _IOC_WRITE, 15, _Buffer)
+VIDIOC_DQBUF = _ioc(_IOC_READ | _IOC_WRITE, 17, _Buffer)
+VIDIOC_STREAMON = _ioc(_IOC_WRITE, 18, ctypes.c_int)
+VIDIOC_STREAMOFF = _ioc(_IOC_WRITE, 19, ctypes.c_int)
+VIDIOC_S_PARM = _ioc(_IOC_READ | _IOC_WRITE, 22, _StreamParm)
+
+
+class V4L2MJPEGCamera:
+    """Camera capture that passes the camera's MJPEG frames through untouched.
+
+    Has the same interface as :class:`OpenCVCamera`. Only MJPG is supported;
+    ``config.fourcc`` is ignored.
+    """
+
+    def __init__(self, config: CameraConfig, frame_buffer: FrameBuffer):
+        self.config = config
+        self.frame_buffer = frame_buffer
+        self._fd: Optional[int] = None
+        self._buffers: list[mmap.mmap] = []
+        self._width = config.width
+        self._height = config.height
+        self._fps = float(config.fps)
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._callbacks: tuple[Callable[[np.ndarray], None], ...] = ()
+        self._callbacks_lock = threading.Lock()
+
+    def start(self) -> bool:
+        """Start the camera capture thread.
+
+        Returns:
+            True if camera started successfully, False otherwise.
+        """
+        if self._running:
+            logger.warning("Camera already running")
+            return True
+        # A capture loop that ended on its own (e.g. unplug) left the device open
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self._release()
+
+        try:
+            self._fd = os.open(self.config.device, os.O_RDWR | os.O_NONBLOCK)
+        except OSError as e:
+            logger.error(f"Failed to open camera: {self.config.device} ({e})")
+            return False
+
+        try:
+            self._configure()
+            self._map_buffers()
+            fcntl.ioctl(self._fd, VIDIOC_STREAMON, ctypes.c_int(V4L2_BUF_TYPE_VIDEO_CAPTURE))
+        except OSError as e:
+            logger.error(f"Failed to start MJPEG streaming on {self.config.device}: {e}")
+            self._release()
+            return False
+
+        logger.info(
+            f"Camera opened (V4L2 MJPEG): {self._width}x{self._height} @ {self._fps:.1f} fps"
+        )
+
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._capture_loop, name="camera-capture", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def _configure(self) -> None:
+        """Negotiate MJPG format, size and frame rate with the driver."""
+        fmt = _Format()
+        fmt.type = V4L2_BUF_TYPE_VIDEO_CAPTURE
+        fmt.fmt.pix.width = self.config.width
+        fmt.fmt.pix.height = self.config.height
+        fmt.fmt.pix.pixelformat = V4L2_PIX_FMT_MJPEG
+        fmt.fmt.pix.field = V4L2_FIELD_ANY
+        fcntl.ioctl(self._fd, VIDIOC_S_FMT, fmt)
+        if fmt.fmt.pix.pixelformat != V4L2_PIX_FMT_MJPEG:
+            raise OSError(errno.EINVAL, "camera does not support MJPG")
+        self._width = fmt.fmt.pix.width
+        self._height = fmt.fmt.pix.height
+
+        parm = _StreamParm()
+        parm.type = V4L2_BUF_TYPE_VIDEO_CAPTURE
+        parm.parm.capture.timeperframe.numerator = 1
+        parm.parm.capture.timeperframe.denominator = self.config.fps
+        try:
+            fcntl.ioctl(self._fd, VIDIOC_S_PARM, parm)
+            tpf = parm.parm.capture.timeperframe
+            if tpf.numerator:
+                self._fps = tpf.denominator / tpf.numerator
+        except OSError as e:
+            # Not all drivers allow setting the frame rate
+            logger.warning(f"Could not set frame rate: {e}")
+
+    def _map_buffers(self) -> None:
+        """Allocate, mmap and queue the driver's capture buffers."""
+        req = _RequestBuffers()
+        req.count = BUFFER_COUNT
+        req.type = V4L2_BUF_TYPE_VIDEO_CAPTURE
+        req.memory = V4L2_MEMORY_MMAP
+        fcntl.ioctl(self._fd, VIDIOC_REQBUFS, req)
+
+        for index in range(req.count):
+            buf = _Buffer()
+            buf.index = index
+            buf.type = V4L2_BUF_TYPE_VIDEO_CAPTURE
+            buf.memory = V4L2_MEMORY_MMAP
+            fcntl.ioctl(self._fd, VIDIOC_QUERYBUF, buf)
+            self._buffers.append(
+                mmap.mmap(
+                    self._fd,
+                    buf.length,
+                    mmap.MAP_SHARED,
+                    mmap.PROT_READ | mmap.PROT_WRITE,
+                    offset=buf.m.offset,
+                )
+            )
+            fcntl.ioctl(self._fd, VIDIOC_QBUF, buf)
+
+    def _release(self) -> None:
+        """Stop streaming and release the driver buffers and device."""
+        if self._fd is None:
+            return
+        try:
+            fcntl.ioctl(self._fd, VIDIOC_STREAMOFF, ctypes.c_int(V4L2_BUF_TYPE_VIDEO_CAPTURE))
+        except OSError:
+            pass
+        for mm in self._buffers:
+            mm.close()
+        self._buffers = []
+        os.close(self._fd)
+        self._fd = None
+
+    def stop(self) -> None:
+        """Stop the camera capture."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self._release()
+        logger.info("Camera stopped")
+
+    def add_frame_callback(self, callback: Callable[[np.ndarray], None]) -> None:
+        """Add a callback to be called for each captured frame.
+
+        Frames are only decoded to BGR while at least one callback is
+        registered. The frame must not be modified, and callbacks that keep
+        it beyond the call should copy it.
+        """
+        with self._callbacks_lock:
+            self._callbacks = self._callbacks + (callback,)
+
+    def remove_frame_callback(self, callback: Callable[[np.ndarray], None]) -> None:
+        """Remove a frame callback."""
+        with self._callbacks_lock:
+            self._callbacks = tuple(cb for cb in self._callbacks if cb != callback)
+
+    def _capture_loop(self) -> None:
+        """Main capture loop running in a separate thread."""
+        tune_current_thread(self.config.capture_cpu, self.config.capture_priority)
+        buf = _Buffer()
+        while self._running:
+            readable, _, _ = select.select([self._fd], [], [], 1.0)
+            if not readable:
+                logger.warning("Timed out waiting for frame from camera")
+                continue
+
+            buf.type = V4L2_BUF_TYPE_VIDEO_CAPTURE
+            buf.memory = V4L2_MEMORY_MMAP
+            try:
+                fcntl.ioctl(self._fd, VIDIOC_DQBUF, buf)
+            except BlockingIOError:
+                continue
+            except OSError as e:
+                # e.g. ENODEV once the camera is unplugged
+                logger.error(f"Failed to dequeue frame: {e}")
+                self._running = False
+                break
+
+            # Copy the frame out so the driver buffer can be requeued at once
+            jpeg = None
+            if buf.bytesused and not buf.flags & V4L2_BUF_FLAG_ERROR:
+                jpeg = self._buffers[buf.index][: buf.bytesused]
+            try:
+                fcntl.ioctl(self._fd, VIDIOC_QBUF, buf)
+            except OSError as e:
+                logger.error(f"Failed to requeue frame buffer: {e}")
+                self._running = False
+                break
+
+            if jpeg is None:
+                logger.warning("Failed to read frame from camera")
+                continue
+
+            self.frame_buffer.put_jpeg(jpeg)
+
+            callbacks = self._callbacks
+            if callbacks:
+                # Decodes the JPEG; off the hub thread under eventlet/gevent
+                frame = run_blocking(self.frame_buffer.get_nowait)
+                if frame is None:
+                    continue
+                for callback in callbacks:
+                    try:
+                        callback(frame)
+                    except Exception as e:
+                        logger.error(f"Frame callback error: {e}")
+
+    @property
+    def is_running(self) -> bool:
+        """Return whether the camera is running."""
+        return self._running
+
+    @property
+    def device(self) -> str:
+        """Return the device path."""
+        return self.config.device
+
+    def get_properties(self) -> dict:
+        """Get current camera properties."""
+        if self._fd is None:
+            return {}
+        return {
+            "width": self._width,
+            "height": self._height,
+            "fps": self._fps,
+            "fourcc": "MJPG",
+        }
@@ -1,9 +1,11 @@
 """Configuration settings for the camera streaming server."""
 
 from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping, Optional
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CameraConfig:
     """Camera capture configuration."""
 
@@ -12,9 +14,19 @@ class CameraConfig:
     height: int = 720
     fps: int = 30
     fourcc: str = "MJPG"
-
-
-@dataclass
+    # Capture backend: "opencv" decodes every frame to BGR; "v4l2" reads the
+    # camera's MJPEG frames directly and only decodes them on demand.
+    backend: str = "opencv"
+    # OpenCV backend only: with fourcc "MJPG", keep frames as the camera's
+    # JPEG bytes instead of decoding each one to BGR.
+    jpeg_passthrough: bool = False
+    # Optional CPU to pin the capture thread to and SCHED_FIFO priority for it
+    # (needs root or CAP_SYS_NICE); None keeps the OS defaults.
+    capture_cpu: Optional[int] = None
+    capture_priority: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
 class H264Config:
     """H.264 encoder configuration."""
 
@@ -23,9 +35,16 @@ class H264Config:
     tune: str = "zerolatency"
     gop_size: int = 30
     use_hardware: bool = True
+    # libx264 only: force low-latency CBR rate control (zerolatency, no
+    # B-frames, bounded VBV) on top of the preset/tune above.
+    live_mode: bool = True
+    # Optional CPU to pin each encoder's I/O thread to and nice value for it
+    # (negative values need root or CAP_SYS_NICE); None keeps the OS defaults.
+    io_cpu: Optional[int] = None
+    io_nice: Optional[int] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class QualityPreset:
     """Video quality preset."""
 
@@ -35,24 +54,28 @@ class QualityPreset:
     bitrate: str
 
 
-QUALITY_PRESETS: dict[str, QualityPreset] = {
+QUALITY_PRESETS: Mapping[str, QualityPreset] = MappingProxyType({
     "low": QualityPreset(640, 480, 15, "500k"),
     "medium": QualityPreset(1280, 720, 30, "1M"),
     "high": QualityPreset(1920, 1080, 30, "2M"),
-}
+})
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ServerConfig:
     """Server configuration."""
 
     host: str = "0.0.0.0"
     port: int = 5000
     debug: bool = False
-    cors_origins: list[str] = field(default_factory=lambda: ["*"])
+    # Socket.IO async mode: "threading", "eventlet" or "gevent". Threading is
+    # the default because the green-thread modes monkey-patch blocking I/O and
+    # do not cooperate well with the V4L2 capture and FFmpeg threads.
+    async_mode: str = "threading"
+    cors_origins: tuple[str, ...] = ("*",)
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """Application configuration."""
 
@@ -1,6 +1,6 @@
 """Video encoders module."""
 
 from .h264 import H264Encoder
-from .mjpeg import encode_jpeg
+from .mjpeg import MJPEGEncoder, decode_jpeg_scaled, encode_jpeg
 
-__all__ = ["H264Encoder", "encode_jpeg"]
+__all__ = ["H264Encoder", "MJPEGEncoder", "decode_jpeg_scaled", "encode_jpeg"]
@@ -1,24 +1,39 @@
 """H.264 encoding using FFmpeg subprocess."""
 
 import logging
+import os
+import selectors
 import shutil
 import subprocess
 import threading
-from queue import Empty, Queue
+from collections import deque
 from typing import Callable, Optional
 
+import cv2
 import numpy as np
 
 from ..config import H264Config, QualityPreset
+from ..utils import tune_current_thread
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_kbps(bitrate: str) -> int:
+    """Convert an FFmpeg bitrate string such as "500k" or "2M" to kbit/s."""
+    value = bitrate.strip().lower()
+    if value.endswith("m"):
+        return int(float(value[:-1]) * 1000)
+    if value.endswith("k"):
+        return int(float(value[:-1]))
+    return int(float(value)) // 1000
+
+
 class H264Encoder:
     """H.264 encoder using FFmpeg subprocess.
 
     Receives BGR frames and outputs H.264 NAL units via callback.
-    Uses hardware encoding (h264_v4l2m2m) on Pi 4, falls back to libx264.
+    Uses hardware encoding (h264_v4l2m2m on Pi 4, h264_omx on older
+    Raspberry Pi OS builds), falls back to libx264.
     """
 
     def __init__(
@@ -26,15 +41,37 @@ class H264Encoder:
         config: H264Config,
         preset: QualityPreset,
         on_data: Callable[[bytes], None],
+        source_size: Optional[tuple[int, int]] = None,
+        output_chunk_size: int = 65536,
     ):
         self.config = config
         self.preset = preset
         self.on_data = on_data
+        # (width, height) of the frames that will be fed in; FFmpeg scales
+        # them to the preset size itself.
+        self.source_size = source_size or (preset.width, preset.height)
+        self.output_chunk_size = output_chunk_size
+        # Destination for the (rare) Python-side resize, allocated on first
+        # use and reused across frames. Only the I/O thread touches it and
+        # it is fully written to FFmpeg before the next resize.
+        self._resize_dst: Optional[np.ndarray] = None
         self._process: Optional[subprocess.Popen] = None
+        self._stdin_fd: Optional[int] = None
         self._running = False
-        self._frame_queue: Queue[np.ndarray] = Queue(maxsize=5)
-        self._input_thread: Optional[threading.Thread] = None
-        self._output_thread: Optional[threading.Thread] = None
+        # Only the newest frame is kept: under backpressure older frames are
+        # dropped so latency and memory stay bounded to a single frame.
+        self._frames: deque[np.ndarray] = deque(maxlen=1)
+        # Queued frames are private copies, since writing one to FFmpeg can
+        # outlive the caller's buffer. The copies are recycled: at most one
+        # is being written, one queued and one filled at any time.
+        self._spare_frames: list[np.ndarray] = []
+        self._frames_lock = threading.Lock()
+        # Frame buffer the I/O thread is writing, returned to the spares once sent
+        self._sending: Optional[np.ndarray] = None
+        # Self-pipe used by encode_frame() and stop() to wake the I/O thread
+        self._wake_r: Optional[int] = None
+        self._wake_w: Optional[int] = None
+        self._io_thread: Optional[threading.Thread] = None
 
     def start(self) -> bool:
         """Start the FFmpeg encoder process."""
@@ -49,22 +86,35 @@ class H264Encoder:
         cmd = self._build_ffmpeg_command(encoder)
         logger.info(f"Starting FFmpeg: {' '.join(cmd)}")
 
+        # Frames go to FFmpeg through a bare pipe written with os.write(), so
+        # they are copied straight from the NumPy buffer into the kernel with
+        # no Python file object in between.
+        read_fd, write_fd = os.pipe()
         try:
             self._process = subprocess.Popen(
                 cmd,
-                stdin=subprocess.PIPE,
+                stdin=read_fd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
+                bufsize=0,
             )
         except Exception as e:
             logger.error(f"Failed to start FFmpeg: {e}")
+            os.close(write_fd)
             return False
+        finally:
+            os.close(read_fd)
+        self._stdin_fd = write_fd
+
+        # One thread multiplexes both directions, so every fd it touches is
+        # non-blocking and driven by readiness from the selector.
+        self._wake_r, self._wake_w = os.pipe()
+        for fd in (self._stdin_fd, self._process.stdout.fileno(), self._wake_r, self._wake_w):
+            os.set_blocking(fd, False)
 
         self._running = True
-        self._input_thread = threading.Thread(target=self._input_loop, daemon=True)
-        self._output_thread = threading.Thread(target=self._output_loop, daemon=True)
-        self._input_thread.start()
-        self._output_thread.start()
+        self._io_thread = threading.Thread(target=self._io_loop, name="h264-io", daemon=True)
+        self._io_thread.start()
 
         logger.info(f"H.264 encoder started using {encoder}")
         return True
@@ -72,10 +122,21 @@ class H264Encoder:
     def stop(self) -> None:
         """Stop the encoder."""
         self._running = False
+        self._wake()
+
+        if self._io_thread is not None:
+            self._io_thread.join(timeout=1.0)
+            self._io_thread = None
+        with self._frames_lock:
+            self._frames.clear()
+            self._spare_frames.clear()
+        self._sending = None
+
+        if self._stdin_fd is not None:
+            fd, self._stdin_fd = self._stdin_fd, None
+            os.close(fd)
 
         if self._process is not None:
-            if self._process.stdin:
-                self._process.stdin.close()
             self._process.terminate()
             try:
                 self._process.wait(timeout=2.0)
@@ -83,20 +144,45 @@ class H264Encoder:
                 self._process.kill()
             self._process = None
 
-        if self._input_thread is not None:
-            self._input_thread.join(timeout=1.0)
-        if self._output_thread is not None:
-            self._output_thread.join(timeout=1.0)
+        for fd in (self._wake_r, self._wake_w):
+            if fd is not None:
+                os.close(fd)
+        self._wake_r = self._wake_w = None
 
         logger.info("H.264 encoder stopped")
 
     def encode_frame(self, frame: np.ndarray) -> None:
-        """Queue a frame for encoding."""
+        """Queue a frame for encoding.
+
+        The frame is copied before this returns, so the caller may reuse or
+        overwrite it straight away.
+        """
         if not self._running:
             return
+        with self._frames_lock:
+            copy = self._spare_frames.pop() if self._spare_frames else None
+        if copy is None or copy.shape != frame.shape or copy.dtype != frame.dtype:
+            copy = np.empty(frame.shape, dtype=frame.dtype)
+        np.copyto(copy, frame)
+
+        with self._frames_lock:
+            if self._frames:
+                # Replaces a frame FFmpeg never got to; reuse its buffer
+                self._spare_frames.append(self._frames.popleft())
+            self._frames.append(copy)
+        self._wake()
+
+    def _recycle(self, frame: np.ndarray) -> None:
+        """Return a queued frame's buffer to the spares."""
+        with self._frames_lock:
+            self._spare_frames.append(frame)
+
+    def _wake(self) -> None:
+        """Wake the I/O thread out of select()."""
         try:
-            self._frame_queue.put_nowait(frame)
-        except:
+            os.write(self._wake_w, b"\0")
+        except (BlockingIOError, OSError, TypeError):
+            # Pipe already full (a wakeup is pending anyway) or not open
             pass
 
     def _select_encoder(self) -> Optional[str]:
@@ -113,6 +199,8 @@ class H264Encoder:
             )
             if "h264_v4l2m2m" in result.stdout:
                 return "h264_v4l2m2m"
+            if "h264_omx" in result.stdout:
+                return "h264_omx"
             logger.info("Hardware encoder not available, using software")
 
         return "libx264"
@@ -125,24 +213,46 @@ class H264Encoder:
             "-loglevel", "warning",
             "-f", "rawvideo",
             "-pixel_format", "bgr24",
-            "-video_size", f"{self.preset.width}x{self.preset.height}",
+            "-video_size", f"{self.source_size[0]}x{self.source_size[1]}",
             "-framerate", str(self.preset.fps),
             "-i", "-",
         ]
 
+        if self.source_size != (self.preset.width, self.preset.height):
+            # Scale inside FFmpeg (swscale) rather than in Python
+            cmd.extend([
+                "-vf", f"scale={self.preset.width}:{self.preset.height}:flags=fast_bilinear",
+            ])
+
         if encoder == "h264_v4l2m2m":
             cmd.extend([
                 "-c:v", "h264_v4l2m2m",
                 "-b:v", self.preset.bitrate,
             ])
+        elif encoder == "h264_omx":
+            # h264_omx rejects the x264 -preset/-tune options
+            cmd.extend([
+                "-c:v", "h264_omx",
+                "-b:v", self.preset.bitrate,
+                "-profile:v", "baseline",
+            ])
         else:
             cmd.extend([
                 "-c:v", "libx264",
                 "-preset", self.config.preset,
-                "-tune", self.config.tune,
+                "-tune", "zerolatency" if self.config.live_mode else self.config.tune,
                 "-b:v", self.preset.bitrate,
                 "-g", str(self.config.gop_size),
             ])
+            if self.config.live_mode:
+                # Constant-rate, no B-frames and a two-second VBV so x264 emits
+                # each frame as soon as it is encoded. Intra refresh is left
+                # off: viewers joining mid-stream need regular IDR frames.
+                cmd.extend([
+                    "-x264-params", "nal-hrd=cbr:force-cfr=1:bframes=0",
+                    "-maxrate", self.preset.bitrate,
+                    "-bufsize", f"{2 * _parse_kbps(self.preset.bitrate)}k",
+                ])
 
         cmd.extend([
             "-f", "h264",
@@ -151,47 +261,100 @@ class H264Encoder:
 
         return cmd
 
-    def _input_loop(self) -> None:
-        """Feed frames to FFmpeg stdin."""
-        while self._running and self._process is not None:
-            try:
-                frame = self._frame_queue.get(timeout=0.1)
-            except Empty:
-                continue
-
-            if self._process.stdin is None:
-                break
-
-            resized = self._resize_frame(frame)
+    def _next_frame(self) -> Optional[memoryview]:
+        """Take the newest queued frame as raw bytes ready for FFmpeg."""
+        with self._frames_lock:
             try:
-                self._process.stdin.write(resized.tobytes())
-            except (BrokenPipeError, OSError):
-                logger.warning("FFmpeg stdin closed")
-                break
-
-    def _output_loop(self) -> None:
-        """Read H.264 data from FFmpeg stdout."""
-        buffer_size = 4096
-        while self._running and self._process is not None:
-            if self._process.stdout is None:
-                break
-
-            try:
-                data = self._process.stdout.read(buffer_size)
-                if not data:
-                    break
-                self.on_data(data)
-            except Exception as e:
-                logger.error(f"Error reading FFmpeg output: {e}")
-                break
+                frame = self._frames.popleft()
+            except IndexError:
+                return None
+        resized = self._resize_frame(frame)
+        if resized is frame:
+            # Written straight from the queued copy, which is recycled once sent
+            self._sending = frame
+        else:
+            self._recycle(frame)
+        return memoryview(resized).cast("B")
+
+    def _frame_sent(self) -> None:
+        """Recycle the buffer of the frame that was just written to FFmpeg."""
+        if self._sending is not None:
+            self._recycle(self._sending)
+            self._sending = None
+
+    def _io_loop(self) -> None:
+        """Feed frames to FFmpeg stdin and read H.264 data from its stdout.
+
+        stdout and the wake pipe are always watched for reads; stdin is only
+        watched for writability while part of a frame is still pending, so
+        the thread sleeps in select() whenever there is nothing to do.
+        """
+        tune_current_thread(self.config.io_cpu, nice=self.config.io_nice)
+
+        stdin_fd = self._stdin_fd
+        stdout = self._process.stdout
+        # Read into one reusable buffer; each read returns whatever FFmpeg has
+        # written so far (up to the chunk size), so callbacks stay infrequent
+        # without delaying data.
+        buf = bytearray(self.output_chunk_size)
+        view = memoryview(buf)
+        pending: Optional[memoryview] = None
+        writing = False
+
+        with selectors.DefaultSelector() as sel:
+            sel.register(stdout, selectors.EVENT_READ, "out")
+            sel.register(self._wake_r, selectors.EVENT_READ, "wake")
+
+            while self._running:
+                if pending is None:
+                    pending = self._next_frame()
+                if (pending is not None) != writing:
+                    writing = not writing
+                    if writing:
+                        sel.register(stdin_fd, selectors.EVENT_WRITE, "in")
+                    else:
+                        sel.unregister(stdin_fd)
+
+                for key, _ in sel.select():
+                    try:
+                        if key.data == "wake":
+                            os.read(self._wake_r, 4096)
+                        elif key.data == "in":
+                            written = os.write(stdin_fd, pending)
+                            pending = pending[written:] or None
+                            if pending is None:
+                                self._frame_sent()
+                        else:
+                            n = stdout.readinto(buf)
+                            if n == 0:
+                                logger.warning("FFmpeg stdout closed")
+                                return
+                            if n:
+                                self.on_data(bytes(view[:n]))
+                    except BlockingIOError:
+                        continue
+                    except OSError as e:
+                        logger.warning(f"FFmpeg pipe error: {e}")
+                        return
+                    except Exception as e:
+                        logger.error(f"Error handling FFmpeg output: {e}")
+                        return
 
     def _resize_frame(self, frame: np.ndarray) -> np.ndarray:
-        """Resize frame to match encoder preset if needed."""
-        import cv2
+        """Resize a frame to the size FFmpeg expects, if it differs.
 
+        Normally frames already match ``source_size`` and are passed through;
+        this only guards against the camera delivering a different size than
+        it reported when the encoder was started.
+        """
         h, w = frame.shape[:2]
-        if w != self.preset.width or h != self.preset.height:
-            return cv2.resize(frame, (self.preset.width, self.preset.height))
+        if (w, h) != self.source_size:
+            if self._resize_dst is None:
+                width, height = self.source_size
+                self._resize_dst = np.empty((height, width, 3), dtype=np.uint8)
+            return cv2.resize(
+                frame, self.source_size, dst=self._resize_dst, interpolation=cv2.INTER_LINEAR
+            )
         return frame
 
     @property
@@ -49,13 +49,18 @@ class LocalDisplay:
         """Main display loop."""
         cv2.namedWindow(WINDOW_NAME, cv2.WINDOW_NORMAL)
 
+        last_count = 0
         while self._running:
-            frame = self.frame_buffer.get(timeout=0.1)
+            # Only redraw (and pump the GUI briefly) when a new frame arrived;
+            # otherwise pump events at a relaxed pace while waiting.
+            frame, last_count = self.frame_buffer.get_next(last_count, timeout=0.1)
             if frame is not None:
                 cv2.imshow(WINDOW_NAME, frame)
+                key = cv2.waitKey(1) & 0xFF
+            else:
+                key = cv2.waitKey(10) & 0xFF
 
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord("q"):
+            if key == ord("q") or cv2.getWindowProperty(WINDOW_NAME, cv2.WND_PROP_VISIBLE) < 1:
                 logger.info("Preview window closed by user")
                 self._running = False
                 break
@@ -5,8 +5,27 @@ import logging
 import threading
 from typing import Any, Optional
 
+try:
+    import serial
+except ImportError:
+    serial = None
+
 logger = logging.getLogger(__name__)
 
+# orjson serialises straight to bytes in C; the stdlib fallback uses compact
+# separators so both produce the same wire format.
+try:
+    import orjson
+
+    def _encode_command(command_array: list[Any]) -> bytes:
+        """Serialise a command as one newline-terminated JSON line."""
+        return orjson.dumps(command_array, option=orjson.OPT_APPEND_NEWLINE)
+
+except ImportError:
+    def _encode_command(command_array: list[Any]) -> bytes:
+        """Serialise a command as one newline-terminated JSON line."""
+        return (json.dumps(command_array, separators=(",", ":")) + "\n").encode("utf-8")
+
 
 class RobotSerialDevice:
     """Thread-safe serial communication with USB robot controller.
@@ -15,19 +34,45 @@ class RobotSerialDevice:
     via USB serial connection. Supports sending JSON arrays for drive commands.
     """
 
-    def __init__(self, port: str, baud_rate: int = 115200, timeout: float = 1.0):
+    def __init__(
+        self,
+        port: str,
+        baud_rate: int = 115200,
+        timeout: float = 1.0,
+        batch_size: int = 1,
+        max_batch_delay: float = 0.05,
+    ):
         """Initialize robot serial device.
 
         Args:
             port: Serial port path (e.g., /dev/ttyUSB0, /dev/ttyACM0)
             baud_rate: Serial baud rate (default: 115200)
             timeout: Read/write timeout in seconds
+            batch_size: Number of commands to collect before writing them to
+                the port in one go (default: 1, i.e. write every command
+                immediately). Only useful for controllers that accept
+                pipelined commands.
+            max_batch_delay: Longest time in seconds a queued command waits
+                for its batch to fill before it is written anyway, so the
+                last command of a burst (e.g. a stop) is never held back.
         """
         self.port = port
         self.baud_rate = baud_rate
         self.timeout = timeout
+        self.batch_size = max(1, batch_size)
+        self.max_batch_delay = max_batch_delay
         self._serial = None
-        self._lock = threading.Lock()
+        # Encoded commands not yet written; guarded by _io_lock
+        self._pending = bytearray()
+        self._pending_count = 0
+        # Writes the pending batch once max_batch_delay has passed; the batch
+        # number tells it whether that batch was already written meanwhile
+        self._batch_timer: Optional[threading.Timer] = None
+        self._batch_number = 0
+        # Serialises open/close and every write/read exchange on the port.
+        # _connected is only written under it, but read without it so status
+        # polling never waits behind a serial transfer.
+        self._io_lock = threading.Lock()
         self._connected = False
 
     def connect(self) -> bool:
@@ -36,13 +81,15 @@ class RobotSerialDevice:
         Returns:
             True if connection successful, False otherwise.
         """
-        with self._lock:
+        with self._io_lock:
             if self._connected:
                 return True
 
-            try:
-                import serial
+            if serial is None:
+                logger.error("pyserial library not installed. Install with: pip install pyserial")
+                return False
 
+            try:
                 self._serial = serial.Serial(
                     port=self.port,
                     baudrate=self.baud_rate,
@@ -53,18 +100,16 @@ class RobotSerialDevice:
                 logger.info(f"Connected to robot controller on {self.port} @ {self.baud_rate} baud")
                 return True
 
-            except ImportError:
-                logger.error("pyserial library not installed. Install with: pip install pyserial")
-                return False
             except Exception as e:
                 logger.error(f"Failed to connect to robot controller on {self.port}: {e}")
                 return False
 
     def disconnect(self) -> None:
         """Close serial connection."""
-        with self._lock:
+        with self._io_lock:
             if self._serial and self._connected:
                 try:
+                    self._flush_pending()
                     self._serial.close()
                     logger.info(f"Disconnected from robot controller on {self.port}")
                 except Exception as e:
@@ -72,6 +117,11 @@ class RobotSerialDevice:
                 finally:
                     self._connected = False
                     self._serial = None
+                    self._pending.clear()
+                    self._pending_count = 0
+                    if self._batch_timer is not None:
+                        self._batch_timer.cancel()
+                        self._batch_timer = None
 
     def is_connected(self) -> bool:
         """Check if serial connection is active.
@@ -79,32 +129,44 @@ class RobotSerialDevice:
         Returns:
             True if connected, False otherwise.
         """
-        with self._lock:
-            return self._connected
+        return self._connected
 
-    def send_command(self, command_array: list[Any]) -> tuple[bool, str]:
+    def send_command(self, command_array: list[Any], flush_now: bool = False) -> tuple[bool, str]:
         """Send JSON array command to robot controller.
 
+        With ``batch_size`` > 1 the command is queued and written together
+        with the following ones once the batch is full, or after
+        ``max_batch_delay`` seconds at most.
+
         Args:
             command_array: List of command values to send to robot
                           (e.g., motor speeds, servo positions)
+            flush_now: Write this command and any queued ones immediately,
+                regardless of ``batch_size``.
 
         Returns:
             Tuple of (success, message/error)
         """
-        with self._lock:
+        with self._io_lock:
             if not self._connected or not self._serial:
                 return False, "Robot controller not connected"
 
             try:
-                # Convert array to JSON string and append newline
-                json_str = json.dumps(command_array) + "\n"
+                # Convert array to a newline-terminated JSON line
+                payload = _encode_command(command_array)
+                self._pending += payload
+                self._pending_count += 1
+
+                if self._pending_count < self.batch_size and not flush_now:
+                    if self._pending_count == 1:
+                        self._start_batch_timer()
+                    logger.debug(f"Queued command for robot: {payload[:-1]!r}")
+                    return True, f"Command queued ({self._pending_count}/{self.batch_size})"
 
                 # Send to serial device
-                bytes_written = self._serial.write(json_str.encode('utf-8'))
-                self._serial.flush()
+                bytes_written = self._flush_pending()
 
-                logger.debug(f"Sent {bytes_written} bytes to robot: {json_str.strip()}")
+                logger.debug(f"Sent {bytes_written} bytes to robot: {payload[:-1]!r}")
 
                 return True, f"Command sent successfully ({bytes_written} bytes)"
 
@@ -127,17 +189,18 @@ class RobotSerialDevice:
         Returns:
             Tuple of (success, message/error, response_data)
         """
-        with self._lock:
+        with self._io_lock:
             if not self._connected or not self._serial:
                 return False, "Robot controller not connected", None
 
             try:
-                # Send command
-                json_str = json.dumps(command_array) + "\n"
-                bytes_written = self._serial.write(json_str.encode('utf-8'))
-                self._serial.flush()
+                # Send command, after any queued ones so ordering is kept
+                payload = _encode_command(command_array)
+                self._pending += payload
+                self._pending_count += 1
+                bytes_written = self._flush_pending()
 
-                logger.debug(f"Sent {bytes_written} bytes to robot: {json_str.strip()}")
+                logger.debug(f"Sent {bytes_written} bytes to robot: {payload[:-1]!r}")
 
                 # Read response
                 responses = []
@@ -159,16 +222,61 @@ class RobotSerialDevice:
                 logger.error(error_msg)
                 return False, error_msg, None
 
+    def _start_batch_timer(self) -> None:
+        """Schedule the write of a newly started batch; caller holds _io_lock."""
+        timer = threading.Timer(
+            self.max_batch_delay, self._flush_batch_timeout, args=(self._batch_number,)
+        )
+        timer.daemon = True
+        self._batch_timer = timer
+        timer.start()
+
+    def _flush_batch_timeout(self, batch_number: int) -> None:
+        """Timer callback: write a batch that did not fill in time."""
+        with self._io_lock:
+            if batch_number != self._batch_number or not self._connected:
+                return
+            try:
+                bytes_written = self._flush_pending()
+                logger.debug(f"Sent {bytes_written} bytes to robot after batch timeout")
+            except Exception as e:
+                logger.error(f"Failed to send command: {e}")
+
+    def _flush_pending(self) -> int:
+        """Write all queued commands in a single write; caller holds _io_lock.
+
+        Returns:
+            Number of bytes written.
+        """
+        # Whatever is pending now is written (or dropped) below, so the
+        # current batch's timer has nothing left to do
+        self._batch_number += 1
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        if not self._pending:
+            return 0
+        try:
+            bytes_written = self._serial.write(self._pending)
+            self._serial.flush()
+        finally:
+            # Drop the batch even on failure rather than resending stale
+            # drive commands later.
+            self._pending.clear()
+            self._pending_count = 0
+        return bytes_written
+
     def get_info(self) -> dict[str, Any]:
         """Get device information.
 
         Returns:
             Dictionary with device status and configuration.
         """
-        with self._lock:
-            return {
-                "port": self.port,
-                "baud_rate": self.baud_rate,
-                "timeout": self.timeout,
-                "connected": self._connected,
-            }
+        return {
+            "port": self.port,
+            "baud_rate": self.baud_rate,
+            "timeout": self.timeout,
+            "batch_size": self.batch_size,
+            "max_batch_delay": self.max_batch_delay,
+            "connected": self._connected,
+        }
@@ -1,24 +1,51 @@
 """API routes for settings."""
 
+import dataclasses
+import functools
+import io
 import logging
 import os
 import time
-from pathlib import Path
 
+import qrcode
 from flask import Blueprint, Response, current_app, jsonify, request, send_file
 
+from ..camera import create_camera
+from ..encoders import encode_jpeg
+from ..startup import fetch_rover_ip, store_rover_ip
+from ..utils import get_camera_info, get_display_name, list_video_devices
+from .snapshots import cached_slot_snapshot, save_slot_snapshot
+
 logger = logging.getLogger(__name__)
 
 api_bp = Blueprint("api", __name__, url_prefix="/api")
 
 
+@api_bp.record_once
+def _create_snapshots_dir(state) -> None:
+    """Create the snapshots directory once, when the blueprint is registered."""
+    snapshots_dir = state.app.config["snapshots_dir"]
+    try:
+        os.makedirs(snapshots_dir, exist_ok=True)
+    except OSError as e:
+        logger.warning(f"Could not create snapshots directory {snapshots_dir}: {e}")
+
+
 @api_bp.route("/rover-settings", methods=["GET"])
 def get_settings():
     """Get all rover settings."""
     settings = current_app.config.get("settings")
     if settings is None:
         return jsonify({"error": "Settings not initialized"}), 500
-    return jsonify(settings.get_all())
+
+    # Pollers that already have the current settings get a bodiless 304
+    etag = settings.etag
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(settings.get_all())
+    response.set_etag(etag, weak=True)
+    return response
 
 
 @api_bp.route("/rover-settings", methods=["POST"])
@@ -39,21 +66,17 @@ def update_settings():
 @api_bp.route("/available-devices", methods=["GET"])
 def get_available_devices():
     """Get list of available video devices for camera assignment."""
-    from ..utils import get_camera_info, get_display_name
-
     devices = []
-    for i in range(20):  # Check video0 through video19
-        device_path = f"/dev/video{i}"
-        if os.path.exists(device_path):
-            device_info = get_camera_info(device_path)
-            display_name = get_display_name(device_info)
-            devices.append({
-                "path": device_path,
-                "name": display_name,
-                "vendor_id": device_info.vendor_id,
-                "model_id": device_info.model_id,
-                "usb_path": device_info.usb_path,
-            })
+    for device_path in list_video_devices():
+        device_info = get_camera_info(device_path)
+        display_name = get_display_name(device_info)
+        devices.append({
+            "path": device_path,
+            "name": display_name,
+            "vendor_id": device_info.vendor_id,
+            "model_id": device_info.model_id,
+            "usb_path": device_info.usb_path,
+        })
 
     return jsonify({"devices": devices})
 
@@ -87,7 +110,8 @@ def update_cameras():
 @api_bp.route("/switch-camera", methods=["POST"])
 def switch_camera():
     """Switch the active camera and restart streaming."""
-    settings = current_app.config.get("settings")
+    cfg = current_app.config
+    settings = cfg.get("settings")
     data = request.get_json()
     slot = data.get("slot")
 
@@ -105,30 +129,23 @@ def switch_camera():
         return jsonify({"error": "Camera slot not configured or disabled"}), 400
 
     # Save snapshot of current camera before stopping
-    camera = current_app.config.get("camera")
+    camera = cfg.get("camera")
     if camera and camera.is_running:
         current_active_slot = settings.get("active_camera_slot")
         if current_active_slot:
             try:
-                from ..encoders import encode_jpeg
-
-                frame_buffer = current_app.config["frame_buffer"]
-                frame = frame_buffer.get_nowait()
-
-                if frame is not None:
-                    jpeg_data = encode_jpeg(frame)
-                    if jpeg_data:
-                        # Save snapshot to file - use consistent path calculation
-                        # current_app.root_path is src/rpi_camera_stream, go up 2 levels to project root
-                        app_root = Path(current_app.root_path).parent.parent
-                        snapshots_dir = app_root / "snapshots"
-                        snapshots_dir.mkdir(exist_ok=True)
-                        snapshot_path = snapshots_dir / f"slot{current_active_slot}_last.jpg"
-
-                        with open(snapshot_path, "wb") as f:
-                            f.write(jpeg_data)
-
-                        logger.info(f"Saved snapshot for slot {current_active_slot} at {snapshot_path}")
+                frame_buffer = cfg["frame_buffer"]
+
+                # Keep the camera's own JPEG when it delivered one
+                jpeg_data = frame_buffer.get_jpeg_nowait()
+                if jpeg_data is None:
+                    frame = frame_buffer.get_nowait()
+                    if frame is not None:
+                        jpeg_data = encode_jpeg(frame)
+
+                if jpeg_data:
+                    snapshot_path = save_slot_snapshot(current_active_slot, jpeg_data)
+                    logger.info(f"Saved snapshot for slot {current_active_slot} at {snapshot_path}")
             except Exception as e:
                 logger.warning(f"Failed to save snapshot: {e}")
 
@@ -147,27 +164,20 @@ def switch_camera():
     device_path = camera_config["device"]
 
     # Restart camera with new device
-    from ..camera import OpenCVCamera, FrameBuffer
-    from ..config import CameraConfig
-
-    config = current_app.config.get("app_config")
+    config = cfg.get("app_config")
     # Create new camera config with the device from the slot
-    camera_config_obj = CameraConfig(
-        device=device_path,
-        width=config.camera.width,
-        height=config.camera.height,
-        fps=config.camera.fps,
-    )
+    camera_config_obj = dataclasses.replace(config.camera, device=device_path)
 
-    frame_buffer = current_app.config["frame_buffer"]
-    # Clear the frame buffer when switching cameras
+    frame_buffer = cfg["frame_buffer"]
+    # Clear the frame buffers when switching cameras
     frame_buffer.clear()
+    cfg["encoded_buffer"].clear()
 
     logger.info(f"Attempting to start camera on {device_path} (slot {slot})")
-    new_camera = OpenCVCamera(camera_config_obj, frame_buffer)
+    new_camera = create_camera(camera_config_obj, frame_buffer)
 
     if new_camera.start():
-        current_app.config["camera"] = new_camera
+        cfg["camera"] = new_camera
         logger.info(f"Successfully started camera on {device_path} (slot {slot})")
 
         return jsonify({
@@ -198,58 +208,56 @@ def get_slot_snapshot(slot):
     if slot < 1 or slot > 3:
         return jsonify({"error": "Invalid slot number"}), 400
 
-    # Check for saved snapshot - use consistent path calculation
-    # current_app.root_path is src/rpi_camera_stream, go up 2 levels to project root
-    app_root = Path(current_app.root_path).parent.parent
-    snapshots_dir = app_root / "snapshots"
-    snapshot_path = snapshots_dir / f"slot{slot}_last.jpg"
+    response = cached_slot_snapshot(slot)
+    if response is not None:
+        return response
+
+    snapshot_path = os.path.join(current_app.config["snapshots_dir"], f"slot{slot}_last.jpg")
 
     logger.debug(f"Looking for snapshot at: {snapshot_path}")
 
-    if snapshot_path.exists():
-        return send_file(snapshot_path, mimetype="image/jpeg")
-    else:
+    try:
+        mtime = os.stat(snapshot_path).st_mtime
+    except FileNotFoundError:
         return jsonify({"error": f"No snapshot available for this slot (checked: {snapshot_path})"}), 404
 
+    # Conditional so browsers revalidating with If-Modified-Since get a 304
+    # without the JPEG being read off the SD card.
+    return send_file(
+        snapshot_path,
+        mimetype="image/jpeg",
+        conditional=True,
+        max_age=1,
+        last_modified=mtime,
+    )
+
 
 @api_bp.route("/refresh-ip", methods=["POST"])
 def refresh_ip():
     """Manually refresh the rover's public IP from cloud API."""
     settings = current_app.config.get("settings")
 
-    from ..startup import fetch_rover_ip
-
     cloud_location = settings.get("cloud_location")
     if not cloud_location:
         return jsonify({"error": "No cloud_location configured"}), 400
 
-    rover_ip = fetch_rover_ip(cloud_location, timeout=10)
+    # Someone is waiting on this response, so retry only once
+    rover_ip = fetch_rover_ip(cloud_location, max_retries=1)
 
     if rover_ip:
-        settings.set("this_rover_ip", rover_ip)
+        store_rover_ip(settings, rover_ip, cloud_location)
         return jsonify({"success": True, "ip": rover_ip})
     else:
         return jsonify({"error": "Failed to fetch IP from cloud"}), 500
 
 
-@api_bp.route("/qr", methods=["GET"])
-def generate_qr():
-    """Generate QR code for the LAN URL."""
-    import io
-    import qrcode
-
-    settings = current_app.config.get("settings")
-    if settings is None:
-        return jsonify({"error": "Settings not initialized"}), 500
-
-    # Get LAN IP from settings
-    lan_ip = settings.get("lan_ip")
-    if not lan_ip:
-        return jsonify({"error": "LAN IP not detected"}), 500
-
-    # Get port from request (assumes server is running on the same port as this request)
-    port = request.host.split(":")[-1] if ":" in request.host else "5000"
+@functools.lru_cache(maxsize=8)
+def _qr_png(lan_ip: str, port: str) -> bytes:
+    """Render the QR code PNG for the LAN URL.
 
+    Cached on (lan_ip, port), so the image is only rebuilt when the LAN
+    address or port actually changes.
+    """
     # Build full URL
     url = f"http://{lan_ip}:{port}/"
 
@@ -269,10 +277,26 @@ def generate_qr():
     # Convert to bytes
     img_io = io.BytesIO()
     img.save(img_io, "PNG")
-    img_io.seek(0)
+    return img_io.getvalue()
+
+
+@api_bp.route("/qr", methods=["GET"])
+def generate_qr():
+    """Generate QR code for the LAN URL."""
+    settings = current_app.config.get("settings")
+    if settings is None:
+        return jsonify({"error": "Settings not initialized"}), 500
+
+    # Get LAN IP from settings
+    lan_ip = settings.get("lan_ip")
+    if not lan_ip:
+        return jsonify({"error": "LAN IP not detected"}), 500
+
+    # Get port from request (assumes server is running on the same port as this request)
+    port = request.host.split(":")[-1] if ":" in request.host else "5000"
 
     # Create response with cache-control headers to prevent caching
-    response = Response(img_io.read(), mimetype="image/png")
+    response = Response(_qr_png(lan_ip, port), mimetype="image/png")
     response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
     response.headers["Pragma"] = "no-cache"
     response.headers["Expires"] = "0"
@@ -297,7 +321,8 @@ def robot_command():
         - Servo positions: [servo1_angle, servo2_angle, servo3_angle]
         - Mixed commands: [motor_left, motor_right, servo1, servo2, led_state]
     """
-    robot_device = current_app.config.get("robot_device")
+    cfg = current_app.config
+    robot_device = cfg.get("robot_device")
 
     if robot_device is None:
         return jsonify({"error": "Robot device not initialized"}), 500
@@ -342,8 +367,9 @@ def robot_command():
 @api_bp.route("/robot/status", methods=["GET"])
 def robot_status():
     """Get robot device status and configuration."""
-    robot_device = current_app.config.get("robot_device")
-    settings = current_app.config.get("settings")
+    cfg = current_app.config
+    robot_device = cfg.get("robot_device")
+    settings = cfg.get("settings")
 
     if robot_device is None:
         return jsonify({
@@ -361,7 +387,8 @@ def robot_status():
 @api_bp.route("/robot/connect", methods=["POST"])
 def robot_connect():
     """Manually connect to robot device."""
-    robot_device = current_app.config.get("robot_device")
+    cfg = current_app.config
+    robot_device = cfg.get("robot_device")
 
     if robot_device is None:
         return jsonify({"error": "Robot device not initialized"}), 500
@@ -378,7 +405,8 @@ def robot_connect():
 @api_bp.route("/robot/disconnect", methods=["POST"])
 def robot_disconnect():
     """Manually disconnect from robot device."""
-    robot_device = current_app.config.get("robot_device")
+    cfg = current_app.config
+    robot_device = cfg.get("robot_device")
 
     if robot_device is None:
         return jsonify({"error": "Robot device not initialized"}), 500
@@ -0,0 +1,46 @@
+"""HTTP caching helpers for JSON endpoints that clients poll."""
+
+import hashlib
+import json
+from typing import Any
+
+from flask import Response, request
+
+# orjson serialises these small status dicts several times faster than the
+# stdlib; the fallback produces the same compact output.
+try:
+    import orjson
+
+    def dumps_json(payload: Any) -> bytes:
+        """Serialise a payload to compact JSON bytes."""
+        return orjson.dumps(payload)
+
+except ImportError:
+    def dumps_json(payload: Any) -> bytes:
+        """Serialise a payload to compact JSON bytes."""
+        return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def cacheable_json(
+    payload: Any, max_age: int = 1, stale_while_revalidate: int = 2
+) -> Response:
+    """Build a JSON response that pollers can cache and revalidate.
+
+    The ETag is a hash of the serialised body, so a client that already has
+    the same payload gets a bodiless 304 instead.
+
+    Args:
+        payload: JSON-serialisable data for the response body.
+        max_age: Seconds the client may reuse the response without asking.
+        stale_while_revalidate: Seconds a stale response may still be used
+            while the client revalidates in the background.
+
+    Returns:
+        The JSON response, or a 304 if If-None-Match matches.
+    """
+    body = dumps_json(payload)
+    response = Response(body, mimetype="application/json")
+    response.set_etag(hashlib.blake2b(body, digest_size=8).hexdigest())
+    response.cache_control.max_age = max_age
+    response.cache_control.stale_while_revalidate = stale_while_revalidate
+    return response.make_conditional(request)
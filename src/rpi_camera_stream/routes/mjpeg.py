@@ -4,49 +4,65 @@ import logging
 import time
 from typing import Generator
 
-from flask import Blueprint, Response, current_app, jsonify, redirect, render_template, url_for
-
-from ..camera import FrameBuffer
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    jsonify,
+    redirect,
+    render_template,
+    send_from_directory,
+    url_for,
+)
+from werkzeug.exceptions import NotFound
+
+from ..camera import EncodedFrameBuffer, FrameBuffer
 from ..encoders import encode_jpeg
+from ..utils import build_camera_slot_view
+from .caching import cacheable_json
+from .snapshots import cached_slot_snapshot, present_snapshot_files
 
 logger = logging.getLogger(__name__)
 
 mjpeg_bp = Blueprint("mjpeg", __name__, url_prefix="/lan")
 
+# Multipart framing, built once. Each part is sent as a small header chunk
+# followed by the JPEG bytes themselves, so the frame is never copied into a
+# joined buffer. The CRLF closing a part is sent at the start of the next
+# part's header rather than as a chunk of its own.
+_PART_HEAD = b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: "
+_HEAD_END = b"\r\n\r\n"
+_PART_END = b"\r\n"
 
-def _get_frame_buffer() -> FrameBuffer:
-    """Get the frame buffer from the app context."""
-    return current_app.config["frame_buffer"]
-
+# Stand-in for the snapshot cache-busting query value in the cached streams
+# page; replaced with a fresh value on every request.
+_SNAPSHOT_TOKEN = "__SNAPSHOT_T__"
 
-def generate_mjpeg(frame_buffer: FrameBuffer) -> Generator[bytes, None, None]:
-    """Generate MJPEG frames for streaming."""
-    last_frame_time = time.time()
-    target_interval = 1.0 / 30.0  # Target 30 FPS
+# (key, rendered page) for the most recent streams page render
+_streams_page_cache: tuple[object, bytes] = (None, b"")
 
-    while True:
-        # Get latest frame without blocking
-        frame = frame_buffer.get_nowait()
-        if frame is None:
-            time.sleep(0.01)  # Brief sleep if no frame available
-            continue
 
-        jpeg_data = encode_jpeg(frame)
-        if jpeg_data is None:
-            continue
+def generate_mjpeg(encoded_buffer: EncodedFrameBuffer) -> Generator[bytes, None, None]:
+    """Generate MJPEG frames for streaming.
 
-        # Throttle to ~30fps to prevent overwhelming the connection
-        current_time = time.time()
-        elapsed = current_time - last_frame_time
-        if elapsed < target_interval:
-            time.sleep(target_interval - elapsed)
+    Frames are JPEG-encoded once by the shared MJPEGEncoder thread; each
+    client only waits for the next encoded frame and writes it out. The
+    client stays subscribed until the response is closed.
+    """
+    last_seq = encoded_buffer.subscribe()
+    lead = b""
 
-        last_frame_time = time.time()
+    try:
+        while True:
+            jpeg_data, last_seq = encoded_buffer.get(last_seq, timeout=1.0)
+            if jpeg_data is None:
+                continue
 
-        yield (
-            b"--frame\r\n"
-            b"Content-Type: image/jpeg\r\n\r\n" + jpeg_data + b"\r\n"
-        )
+            yield b"".join((lead, _PART_HEAD, str(len(jpeg_data)).encode(), _HEAD_END))
+            yield jpeg_data
+            lead = _PART_END
+    finally:
+        encoded_buffer.unsubscribe()
 
 
 @mjpeg_bp.route("/")
@@ -58,82 +74,54 @@ def index():
 @mjpeg_bp.route("/streams")
 def streams():
     """Render the camera streams overview page with snapshots."""
-    from ..utils import get_camera_info, get_display_name
-    from pathlib import Path
+    cfg = current_app.config
 
     # Get camera slot configuration from settings
-    settings = current_app.config.get("settings")
+    settings = cfg.get("settings")
     camera_configs = settings.get("cameras", [
         {"slot": 1, "device": "", "type": "N", "enabled": False},
         {"slot": 2, "device": "", "type": "N", "enabled": False},
         {"slot": 3, "device": "", "type": "N", "enabled": False},
     ])
 
-    camera_slots = []
-
-    # Map camera type to readable name
-    type_names = {
-        "W": "Wide Angle",
-        "N": "Normal",
-        "IR": "Infrared",
-        "T": "Telephoto"
-    }
-
-    # Check for snapshots directory - use consistent path calculation
-    # current_app.root_path is src/rpi_camera_stream, go up 2 levels to project root
-    app_root = Path(current_app.root_path).parent.parent
-    snapshots_dir = app_root / "snapshots"
-
-    for config in camera_configs:
-        # Skip unconfigured slots
-        if not config["enabled"]:
-            continue
-
-        slot_id = config["slot"] - 1  # Convert to 0-indexed
-        device_path = config["device"]
-        camera_type = config["type"]
-        enabled = config["enabled"]
-
-        # Query device information
-        device_info = get_camera_info(device_path)
-        display_name = get_display_name(device_info)
-
-        # Check if snapshot exists for this slot
-        snapshot_path = snapshots_dir / f"slot{config['slot']}_last.jpg"
-        has_snapshot = snapshot_path.exists()
-
-        camera_slots.append({
-            "id": slot_id,
-            "slot": config["slot"],
-            "name": display_name,
-            "device": device_path or f"Camera {config['slot']}",
-            "type": camera_type,
-            "type_name": type_names.get(camera_type, "Normal"),
-            "exists": device_info.exists,
-            "model_id": device_info.model_id,
-            "vendor_id": device_info.vendor_id,
-            "enabled": enabled,
-            "has_snapshot": has_snapshot,
-        })
+    # One directory listing instead of a stat() per slot
+    camera_slots = build_camera_slot_view(
+        camera_configs, settings.get("active_camera_slot"), present_snapshot_files()
+    )
 
     # If no cameras are configured, redirect to settings page
     if not camera_slots:
         return redirect(url_for('settings.index'))
 
-    # Get the active camera slot from settings
-    active_slot = settings.get("active_camera_slot")
-
-    # Mark the active camera slot
-    for cam in camera_slots:
-        cam["active"] = (cam["slot"] == active_slot) if active_slot else False
+    # The page only changes with the settings (which base.html embeds) and
+    # the per-slot view, so reuse the last render while both are unchanged.
+    global _streams_page_cache
+    key = (
+        id(current_app._get_current_object()),
+        settings.etag,
+        tuple(tuple(cam.items()) for cam in camera_slots),
+    )
+    cached_key, page = _streams_page_cache
+    if cached_key != key:
+        page = render_template(
+            "streams_pico.html",
+            cameras=camera_slots,
+            rover_name=settings.get("rover_name", "Cattern Rover"),
+            snapshot_token=_SNAPSHOT_TOKEN,
+        ).encode("utf-8")
+        _streams_page_cache = (key, page)
 
-    return render_template("streams_pico.html", cameras=camera_slots, rover_name=settings.get("rover_name", "Cattern Rover"))
+    return Response(
+        page.replace(_SNAPSHOT_TOKEN.encode(), str(time.time_ns()).encode()),
+        mimetype="text/html",
+    )
 
 
 @mjpeg_bp.route("/stream/<int:slot>")
 def stream(slot):
     """Render individual camera live stream page."""
-    settings = current_app.config.get("settings")
+    cfg = current_app.config
+    settings = cfg.get("settings")
     cameras = settings.get("cameras", [])
 
     # Validate slot number
@@ -152,7 +140,7 @@ def stream(slot):
         return jsonify({"error": f"Camera {slot} is not active. Active camera: {active_slot}"}), 400
 
     # Get camera properties for resolution info
-    camera = current_app.config.get("camera")
+    camera = cfg.get("camera")
     properties = camera.get_properties() if camera and camera.is_running else {}
 
     return render_template("streams_simple.html", camera_id=slot, camera_type=camera_config["type"], properties=properties)
@@ -161,7 +149,8 @@ def stream(slot):
 @mjpeg_bp.route("/video_feed")
 def video_feed():
     """MJPEG video stream endpoint."""
-    camera = current_app.config.get("camera")
+    cfg = current_app.config
+    camera = cfg.get("camera")
 
     if camera is None:
         logger.warning("Video feed requested but camera is None")
@@ -171,24 +160,30 @@ def video_feed():
         logger.warning(f"Video feed requested but camera is not running (device: {camera.device})")
         return jsonify({"error": "Camera not running", "device": camera.device}), 503
 
-    frame_buffer = _get_frame_buffer()
+    encoded_buffer = cfg["encoded_buffer"]
     return Response(
-        generate_mjpeg(frame_buffer),
+        generate_mjpeg(encoded_buffer),
         mimetype="multipart/x-mixed-replace; boundary=frame",
+        # Tell nginx (if proxied) to pass each part on as soon as it's written
+        headers={"X-Accel-Buffering": "no"},
     )
 
 
 @mjpeg_bp.route("/api/snapshot")
 def snapshot():
     """Get a single JPEG snapshot."""
-    frame_buffer = _get_frame_buffer()
-    frame = frame_buffer.get_nowait()
-    if frame is None:
-        return jsonify({"error": "No frame available"}), 503
+    frame_buffer: FrameBuffer = current_app.config["frame_buffer"]
 
-    jpeg_data = encode_jpeg(frame)
+    # Serve the camera's own JPEG when it delivered one, else encode
+    jpeg_data = frame_buffer.get_jpeg_nowait()
     if jpeg_data is None:
-        return jsonify({"error": "Failed to encode frame"}), 500
+        frame = frame_buffer.get_nowait()
+        if frame is None:
+            return jsonify({"error": "No frame available"}), 503
+
+        jpeg_data = encode_jpeg(frame)
+        if jpeg_data is None:
+            return jsonify({"error": "Failed to encode frame"}), 500
 
     return Response(jpeg_data, mimetype="image/jpeg")
 
@@ -196,19 +191,22 @@ def snapshot():
 @mjpeg_bp.route("/api/snapshot/<int:slot>")
 def snapshot_by_slot(slot):
     """Get the saved snapshot for a specific camera slot."""
-    from pathlib import Path
-
-    # current_app.root_path is src/rpi_camera_stream, go up 2 levels to project root
-    app_root = Path(current_app.root_path).parent.parent
-    snapshot_path = app_root / "snapshots" / f"slot{slot}_last.jpg"
-
-    if not snapshot_path.exists():
-        return jsonify({"error": f"No snapshot found for slot {slot}"}), 404
+    response = cached_slot_snapshot(slot)
+    if response is not None:
+        return response
 
+    # Let the WSGI server stream the file (sendfile where supported) and
+    # answer revalidating browsers with 304
     try:
-        with open(snapshot_path, "rb") as f:
-            jpeg_data = f.read()
-        return Response(jpeg_data, mimetype="image/jpeg")
+        return send_from_directory(
+            current_app.config["snapshots_dir"],
+            f"slot{slot}_last.jpg",
+            mimetype="image/jpeg",
+            conditional=True,
+            max_age=1,
+        )
+    except NotFound:
+        return jsonify({"error": f"No snapshot found for slot {slot}"}), 404
     except Exception as e:
         logger.error(f"Failed to read snapshot for slot {slot}: {e}")
         return jsonify({"error": "Failed to read snapshot"}), 500
@@ -217,12 +215,13 @@ def snapshot_by_slot(slot):
 @mjpeg_bp.route("/api/status")
 def status():
     """Get camera status."""
-    camera = current_app.config.get("camera")
+    cfg = current_app.config
+    camera = cfg.get("camera")
     if camera is None:
         return jsonify({"status": "not_initialized"})
 
-    return jsonify({
+    return cacheable_json({
         "status": "running" if camera.is_running else "stopped",
         "properties": camera.get_properties(),
-        "frame_count": _get_frame_buffer().frame_count,
+        "frame_count": cfg["frame_buffer"].frame_count,
     })
@@ -0,0 +1,68 @@
+"""Saved per-slot snapshots, kept on disk and in memory."""
+
+import hashlib
+import os
+from typing import Optional
+
+from flask import Response, current_app, request
+
+
+def save_slot_snapshot(slot: int, jpeg_data: bytes) -> str:
+    """Save a slot's last-frame snapshot.
+
+    The file survives restarts; the in-memory copy lets the snapshot routes
+    answer without touching the SD card.
+
+    Args:
+        slot: Camera slot number.
+        jpeg_data: Encoded JPEG image.
+
+    Returns:
+        Path of the written file.
+
+    Raises:
+        OSError: If the file could not be written.
+    """
+    cfg = current_app.config
+    snapshot_path = os.path.join(cfg["snapshots_dir"], f"slot{slot}_last.jpg")
+    with open(snapshot_path, "wb") as f:
+        f.write(jpeg_data)
+
+    etag = hashlib.blake2b(jpeg_data, digest_size=8).hexdigest()
+    cfg["latest_snapshots"][slot] = (jpeg_data, etag)
+    return snapshot_path
+
+
+def present_snapshot_files() -> set[str]:
+    """List the snapshots directory with a single scandir.
+
+    Returns:
+        File names in the snapshots directory; empty if it doesn't exist.
+    """
+    try:
+        with os.scandir(current_app.config["snapshots_dir"]) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+
+def cached_slot_snapshot(slot: int) -> Optional[Response]:
+    """Serve a slot snapshot saved by this process from memory.
+
+    Args:
+        slot: Camera slot number.
+
+    Returns:
+        The JPEG response (or a 304 if If-None-Match matches), or None if no
+        snapshot for the slot has been saved since startup.
+    """
+    entry = current_app.config["latest_snapshots"].get(slot)
+    if entry is None:
+        return None
+
+    jpeg_data, etag = entry
+    response = Response(jpeg_data, mimetype="image/jpeg")
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = 1
+    return response.make_conditional(request)
@@ -3,6 +3,8 @@
 import logging
 from flask import Blueprint, render_template, current_app, jsonify
 
+from .caching import cacheable_json
+
 logger = logging.getLogger(__name__)
 
 www_bp = Blueprint("www", __name__, url_prefix="/www")
@@ -17,13 +19,14 @@ def index():
 @www_bp.route("/api/status")
 def status():
     """Get camera status for WWW clients."""
-    camera = current_app.config.get("camera")
-    settings = current_app.config.get("settings")
+    cfg = current_app.config
+    camera = cfg.get("camera")
+    settings = cfg.get("settings")
 
     if camera is None:
         return jsonify({"status": "not_initialized"})
 
-    return jsonify({
+    return cacheable_json({
         "status": "running" if camera.is_running else "stopped",
         "active_slot": settings.get("active_camera_slot"),
         "rover_ip": settings.get("this_rover_ip"),
@@ -1,7 +1,7 @@
 """WWW API routes for remote video control and snapshot capture."""
 
 import logging
-from pathlib import Path
+import threading
 from typing import Optional
 
 import cv2
@@ -9,20 +9,68 @@ import numpy as np
 from flask import Blueprint, Response, current_app, jsonify, request
 
 from ..config import QUALITY_PRESETS
-from ..encoders.mjpeg import encode_jpeg
+from ..encoders.mjpeg import decode_jpeg_scaled, encode_jpeg
+from ..utils import CAMERA_TYPE_NAMES, run_blocking
+from .caching import dumps_json
+from .snapshots import present_snapshot_files, save_slot_snapshot
 
 logger = logging.getLogger(__name__)
 
 www_api_bp = Blueprint("www_api", __name__, url_prefix="/www/api")
 
+# Static halves of the snapshot/preset info routes, serialised once
+_PRESETS = [
+    {
+        "name": name,
+        "width": preset.width,
+        "height": preset.height,
+        "fps": preset.fps,
+        "bitrate": preset.bitrate,
+    }
+    for name, preset in QUALITY_PRESETS.items()
+]
 
-def _validate_snapshot_params(quality: int, width: int, height: int) -> tuple[bool, str]:
+_SNAPSHOT_SETTINGS_JSON = dumps_json({
+    "default_quality": 85,
+    # Available resolutions based on common presets
+    "available_resolutions": [
+        {"width": 640, "height": 480},
+        {"width": 1280, "height": 720},
+        {"width": 1920, "height": 1080},
+        {"width": 2592, "height": 1944},  # 5MP full resolution
+    ],
+    "quality_range": {"min": 1, "max": 100},
+    "dimension_range": {
+        "width": {"min": 160, "max": 3840},
+        "height": {"min": 120, "max": 2160},
+    },
+})
+
+# Per-thread resize targets for the fixed preset sizes, so quick snapshots
+# don't allocate a fresh output image on every request
+_preset_buffers = threading.local()
+
+
+def _preset_resize_buffer(width: int, height: int) -> np.ndarray:
+    """Return this thread's reusable BGR buffer for a preset size."""
+    buffers = getattr(_preset_buffers, "by_size", None)
+    if buffers is None:
+        buffers = _preset_buffers.by_size = {}
+    buf = buffers.get((width, height))
+    if buf is None:
+        buf = buffers[(width, height)] = np.empty((height, width, 3), dtype=np.uint8)
+    return buf
+
+
+def _validate_snapshot_params(
+    quality: int, width: Optional[int], height: Optional[int]
+) -> tuple[bool, str]:
     """Validate snapshot parameters.
 
     Args:
         quality: JPEG quality (1-100)
-        width: Image width in pixels (160-3840)
-        height: Image height in pixels (120-2160)
+        width: Image width in pixels (160-3840), or None for the frame's width
+        height: Image height in pixels (120-2160), or None for the frame's height
 
     Returns:
         Tuple of (is_valid, error_message). error_message is empty if valid.
@@ -30,37 +78,70 @@ def _validate_snapshot_params(quality: int, width: int, height: int) -> tuple[bo
     if not isinstance(quality, int) or quality < 1 or quality > 100:
         return False, "Quality must be an integer between 1 and 100"
 
-    if not isinstance(width, int) or width < 160 or width > 3840:
+    if width is not None and (not isinstance(width, int) or width < 160 or width > 3840):
         return False, "Width must be an integer between 160 and 3840"
 
-    if not isinstance(height, int) or height < 120 or height > 2160:
+    if height is not None and (not isinstance(height, int) or height < 120 or height > 2160):
         return False, "Height must be an integer between 120 and 2160"
 
     return True, ""
 
 
-def _capture_snapshot(quality: int, width: int, height: int) -> Optional[bytes]:
+def _capture_snapshot(
+    quality: int,
+    width: Optional[int],
+    height: Optional[int],
+    props: Optional[dict] = None,
+    dst: Optional[np.ndarray] = None,
+) -> Optional[bytes]:
     """Capture a snapshot from the frame buffer.
 
     Args:
         quality: JPEG quality (1-100)
-        width: Desired image width
-        height: Desired image height
+        width: Desired image width, or None to keep the frame's width
+        height: Desired image height, or None to keep the frame's height
+        props: Camera properties the caller already fetched, if any
+        dst: Preallocated (height, width, 3) buffer to resize into, if any
 
     Returns:
         JPEG encoded bytes, or None if capture failed.
     """
-    frame_buffer = current_app.config["frame_buffer"]
-    frame = frame_buffer.get_nowait()
+    cfg = current_app.config
+    frame_buffer = cfg["frame_buffer"]
+    frame = None
+
+    # When the camera delivered a JPEG, a size that is an exact fraction of
+    # it can be decoded at that size directly instead of decode + resize.
+    jpeg_data = frame_buffer.get_jpeg_nowait()
+    if jpeg_data is not None and width is not None and height is not None:
+        if props is None:
+            camera = cfg.get("camera")
+            props = camera.get_properties() if camera is not None else {}
+        source_size = (props.get("width"), props.get("height"))
+        if all(source_size) and source_size != (width, height):
+            frame = decode_jpeg_scaled(jpeg_data, source_size, (width, height))
 
     if frame is None:
-        return None
+        frame = frame_buffer.get_nowait()
+        if frame is None:
+            return None
 
-    # Resize if requested dimensions differ from frame
-    if width != frame.shape[1] or height != frame.shape[0]:
-        frame = cv2.resize(frame, (width, height))
+        # The delivered frame is the source of truth for the native size;
+        # the driver may have rounded what the camera properties report
+        if width is None:
+            width = frame.shape[1]
+        if height is None:
+            height = frame.shape[0]
 
-    return encode_jpeg(frame, quality)
+        # Resize if requested dimensions differ from frame; area averaging
+        # is both cheaper and cleaner than bilinear when shrinking
+        if width != frame.shape[1] or height != frame.shape[0]:
+            shrinking = width < frame.shape[1] and height < frame.shape[0]
+            interpolation = cv2.INTER_AREA if shrinking else cv2.INTER_LINEAR
+            frame = cv2.resize(frame, (width, height), dst=dst, interpolation=interpolation)
+
+    # The encode is the slow part; keep it off a green-thread server's hub
+    return run_blocking(encode_jpeg, frame, quality)
 
 
 @www_api_bp.route("/video/quality-presets")
@@ -77,17 +158,6 @@ def quality_presets():
         "camera_native_resolution": {"width": 1280, "height": 720, "fps": 30}
     }
     """
-    # Convert QUALITY_PRESETS to list of dicts
-    presets_list = []
-    for name, preset in QUALITY_PRESETS.items():
-        presets_list.append({
-            "name": name,
-            "width": preset.width,
-            "height": preset.height,
-            "fps": preset.fps,
-            "bitrate": preset.bitrate,
-        })
-
     # Get camera native resolution if running
     camera = current_app.config.get("camera")
     camera_native = None
@@ -100,10 +170,10 @@ def quality_presets():
             "fps": props.get("fps"),
         }
 
-    return jsonify({
-        "presets": presets_list,
-        "camera_native_resolution": camera_native,
-    })
+    return Response(
+        dumps_json({"presets": _PRESETS, "camera_native_resolution": camera_native}),
+        mimetype="application/json",
+    )
 
 
 @www_api_bp.route("/snapshot/capture", methods=["POST"])
@@ -121,17 +191,18 @@ def capture_snapshot():
     Returns:
         JPEG image data (binary)
     """
-    camera = current_app.config.get("camera")
+    cfg = current_app.config
+    camera = cfg.get("camera")
     if not camera or not camera.is_running:
         return jsonify({"error": "Camera not running"}), 503
 
     data = request.get_json() or {}
 
-    # Get camera native resolution as defaults
+    # Missing dimensions default to the captured frame's own size
     props = camera.get_properties()
     quality = data.get("quality", 85)
-    width = data.get("width", props.get("width"))
-    height = data.get("height", props.get("height"))
+    width = data.get("width")
+    height = data.get("height")
     save_to_slot = data.get("save_to_slot", False)
 
     # Validate parameters
@@ -140,26 +211,19 @@ def capture_snapshot():
         return jsonify({"error": error_msg}), 400
 
     # Capture snapshot
-    jpeg_data = _capture_snapshot(quality, width, height)
+    jpeg_data = _capture_snapshot(quality, width, height, props)
 
     if jpeg_data is None:
         return jsonify({"error": "Failed to capture snapshot"}), 503
 
     # Optionally save to slot file
     if save_to_slot:
-        settings = current_app.config.get("settings")
+        settings = cfg.get("settings")
         active_slot = settings.get("active_camera_slot")
 
         if active_slot:
             try:
-                app_root = Path(current_app.root_path).parent.parent
-                snapshots_dir = app_root / "snapshots"
-                snapshots_dir.mkdir(exist_ok=True)
-                snapshot_path = snapshots_dir / f"slot{active_slot}_last.jpg"
-
-                with open(snapshot_path, "wb") as f:
-                    f.write(jpeg_data)
-
+                snapshot_path = save_slot_snapshot(active_slot, jpeg_data)
                 logger.info(f"Saved snapshot to {snapshot_path}")
             except Exception as e:
                 logger.warning(f"Failed to save snapshot to slot: {e}")
@@ -187,23 +251,7 @@ def snapshot_settings():
         }
     }
     """
-    # Available resolutions based on common presets
-    available_resolutions = [
-        {"width": 640, "height": 480},
-        {"width": 1280, "height": 720},
-        {"width": 1920, "height": 1080},
-        {"width": 2592, "height": 1944},  # 5MP full resolution
-    ]
-
-    return jsonify({
-        "default_quality": 85,
-        "available_resolutions": available_resolutions,
-        "quality_range": {"min": 1, "max": 100},
-        "dimension_range": {
-            "width": {"min": 160, "max": 3840},
-            "height": {"min": 120, "max": 2160},
-        },
-    })
+    return Response(_SNAPSHOT_SETTINGS_JSON, mimetype="application/json")
 
 
 @www_api_bp.route("/snapshot/quick", methods=["POST"])
@@ -234,7 +282,13 @@ def quick_snapshot():
     preset = QUALITY_PRESETS[preset_name]
 
     # Capture with preset dimensions and quality 85
-    jpeg_data = _capture_snapshot(85, preset.width, preset.height)
+    jpeg_data = _capture_snapshot(
+        85,
+        preset.width,
+        preset.height,
+        camera.get_properties(),
+        dst=_preset_resize_buffer(preset.width, preset.height),
+    )
 
     if jpeg_data is None:
         return jsonify({"error": "Failed to capture snapshot"}), 503
@@ -266,10 +320,11 @@ def current_settings():
         "is_running": true
     }
     """
-    camera = current_app.config.get("camera")
-    settings = current_app.config.get("settings")
-    app_config = current_app.config.get("app_config")
-    frame_buffer = current_app.config.get("frame_buffer")
+    cfg = current_app.config
+    camera = cfg.get("camera")
+    settings = cfg.get("settings")
+    app_config = cfg.get("app_config")
+    frame_buffer = cfg.get("frame_buffer")
 
     if not camera:
         return jsonify({"error": "Camera not initialized"}), 500
@@ -296,6 +351,7 @@ def current_settings():
         "tune": app_config.h264.tune,
         "gop_size": app_config.h264.gop_size,
         "use_hardware": app_config.h264.use_hardware,
+        "live_mode": app_config.h264.live_mode,
     }
 
     # Get frame count
@@ -333,29 +389,20 @@ def snapshot_slots():
     cameras = settings.get("cameras", [])
     active_slot = settings.get("active_camera_slot")
 
-    # Map type codes to names
-    type_names = {
-        "W": "Wide Angle",
-        "N": "Normal",
-        "IR": "Infrared",
-        "T": "Telephoto",
-    }
-
-    # Check snapshot directory
-    app_root = Path(current_app.root_path).parent.parent
-    snapshots_dir = app_root / "snapshots"
+    # One directory listing instead of a stat() per slot
+    present_snapshots = present_snapshot_files()
 
     slots_info = []
     for camera_config in cameras:
         slot_num = camera_config.get("slot")
+        camera_type = camera_config.get("type")
 
         # Check if snapshot exists for this slot
-        snapshot_path = snapshots_dir / f"slot{slot_num}_last.jpg"
-        has_snapshot = snapshot_path.exists()
+        has_snapshot = f"slot{slot_num}_last.jpg" in present_snapshots
 
         slots_info.append({
             "slot": slot_num,
-            "type": type_names.get(camera_config.get("type"), camera_config.get("type")),
+            "type": CAMERA_TYPE_NAMES.get(camera_type, camera_type),
             "device": camera_config.get("device"),
             "enabled": camera_config.get("enabled", False),
             "active": slot_num == active_slot,
@@ -428,8 +475,9 @@ def robot_command():
 @www_api_bp.route("/robot/status")
 def robot_status():
     """Get robot device status and configuration."""
-    robot_device = current_app.config.get("robot_device")
-    settings = current_app.config.get("settings")
+    cfg = current_app.config
+    robot_device = cfg.get("robot_device")
+    settings = cfg.get("settings")
 
     if robot_device is None:
         return jsonify({
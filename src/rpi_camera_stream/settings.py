@@ -3,16 +3,41 @@
 import json
 import logging
 import os
+import threading
+import time
 from pathlib import Path
 from threading import Lock
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# orjson serialises several times faster than the stdlib; both write the
+# same indented layout so the file stays readable and diffable.
+try:
+    import orjson
+
+    def _dumps(settings: dict[str, Any]) -> bytes:
+        """Serialise settings for the settings file."""
+        try:
+            return orjson.dumps(settings, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            # orjson rejects some values the stdlib accepts, such as integers
+            # beyond 64 bits or non-str keys
+            return json.dumps(settings, indent=2).encode("utf-8")
+
+except ImportError:
+    def _dumps(settings: dict[str, Any]) -> bytes:
+        """Serialise settings for the settings file."""
+        return json.dumps(settings, indent=2).encode("utf-8")
+
+# Longest wait between retries while saving keeps failing, in seconds
+MAX_FLUSH_RETRY_DELAY = 60.0
+
 DEFAULT_SETTINGS = {
     "rover_name": "Cattern Rover LAN",
     "cloud_location": "https://cattern.com",
     "this_rover_ip": None,
+    "this_rover_ip_cache": None,  # {"ip", "cloud_location", "ts"} of the last fetch
     "lan_ip": None,
     "hardware": {
         "cpu_model": "Unknown",
@@ -33,15 +58,29 @@ DEFAULT_SETTINGS = {
         "port": "/dev/ttyUSB0",  # Common for Arduino/Waveshare via USB
         "baud_rate": 115200,
         "timeout": 1.0,
+        "batch_size": 1,  # Commands per serial write (>1 only if the board pipelines)
+        "max_batch_delay": 0.05,  # Seconds a queued command may wait for its batch
         "auto_connect": False,  # Auto-connect on startup
     },
 }
 
 
 class Settings:
-    """Thread-safe JSON file settings manager."""
+    """Thread-safe JSON file settings manager.
 
-    def __init__(self, settings_file: str = None):
+    Changes take effect in memory immediately; writing them to disk is
+    debounced onto a background thread so bursts of changes cost one write.
+    Call flush() before exiting to persist anything still pending.
+
+    Writes go to a temporary file that replaces the settings file, so a
+    crash never leaves it truncated. With ``durable=True`` the data is also
+    fsync'd before the replace, which survives power loss at the cost of a
+    slow SD card sync per write.
+    """
+
+    def __init__(
+        self, settings_file: str = None, flush_delay: float = 0.25, durable: bool = False
+    ):
         if settings_file is None:
             # Default to settings.json in the app directory
             settings_file = os.path.join(
@@ -50,7 +89,23 @@ class Settings:
         self._file_path = Path(settings_file).resolve()
         self._lock = Lock()
         self._settings: dict[str, Any] = {}
+        # Bumped on every change; combined with a per-instance token so an
+        # ETag from before a restart never matches.
+        self._version = 0
+        self._token = os.urandom(4).hex()
+        self._camera_slots: tuple[tuple[Any, Any, bool], ...] = ()
+        self._cameras_version = 0
+        # Seconds to wait after a change so that following ones share a write
+        self._flush_delay = flush_delay
+        self._durable = durable
+        self._dirty = threading.Event()
+        # Serialises file writes between the flusher thread and flush()
+        self._write_lock = Lock()
         self._load()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="settings-flush", daemon=True
+        )
+        self._flusher.start()
 
     def _load(self) -> None:
         """Load settings from JSON file."""
@@ -70,29 +125,83 @@ class Settings:
                             logger.info(f"Added missing setting key: {key}")
 
                     if needs_save:
-                        self._save_unlocked()
+                        self._dirty.set()
 
                 except (json.JSONDecodeError, IOError) as e:
                     logger.error(f"Failed to load settings: {e}")
                     self._settings = DEFAULT_SETTINGS.copy()
             else:
                 self._settings = DEFAULT_SETTINGS.copy()
-                self._save_unlocked()
+                self._dirty.set()
+            self._refresh_cameras_unlocked()
+
+    def _refresh_cameras_unlocked(self) -> None:
+        """Recompute the camera slot summary and its version (must hold lock)."""
+        slots = tuple(
+            (cam.get("slot"), cam.get("device"), bool(cam.get("enabled")))
+            for cam in self._settings.get("cameras") or ()
+        )
+        if slots != self._camera_slots:
+            self._camera_slots = slots
+            self._cameras_version = hash(slots)
+
+    def _flush_loop(self) -> None:
+        """Write pending changes shortly after they are made."""
+        delay = self._flush_delay
+        while True:
+            self._dirty.wait()
+            time.sleep(delay)
+            # Back off while saving keeps failing (e.g. a full or read-only
+            # SD card) instead of retrying every flush_delay
+            if self.flush():
+                delay = self._flush_delay
+            else:
+                delay = min(delay * 2, MAX_FLUSH_RETRY_DELAY)
+
+    def flush(self) -> bool:
+        """Write pending changes to the settings file now, if there are any.
+
+        Returns:
+            False if saving failed; the changes then stay pending and are
+            retried by the next flush.
+        """
+        with self._write_lock:
+            if not self._dirty.is_set():
+                return True
+            # Cleared before the snapshot is taken, so a change made while
+            # writing marks the settings dirty again and gets its own write.
+            self._dirty.clear()
 
-    def _save_unlocked(self) -> None:
-        """Save settings to JSON file (must hold lock)."""
+            tmp_path = self._file_path.with_suffix(".json.tmp")
+            try:
+                with self._lock:
+                    data = _dumps(self._settings)
+                self._file_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                    if self._durable:
+                        f.flush()
+                        os.fsync(f.fileno())
+                # Atomic on POSIX: readers see the old or the new file, never
+                # a partly written one
+                os.replace(tmp_path, self._file_path)
+                if self._durable:
+                    self._fsync_dir()
+                logger.info(f"Saved settings to {self._file_path}")
+            except Exception as e:
+                # Caught broadly so the flusher thread survives any failure
+                logger.error(f"Failed to save settings: {e}")
+                self._dirty.set()
+                return False
+            return True
+
+    def _fsync_dir(self) -> None:
+        """Sync the settings directory so the rename itself is on disk."""
+        fd = os.open(self._file_path.parent, os.O_RDONLY)
         try:
-            self._file_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self._file_path, "w") as f:
-                json.dump(self._settings, f, indent=2)
-            logger.info(f"Saved settings to {self._file_path}")
-        except IOError as e:
-            logger.error(f"Failed to save settings: {e}")
-
-    def _save(self) -> None:
-        """Save settings to JSON file."""
-        with self._lock:
-            self._save_unlocked()
+            os.fsync(fd)
+        finally:
+            os.close(fd)
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get a setting value."""
@@ -100,10 +209,13 @@ class Settings:
             return self._settings.get(key, default)
 
     def set(self, key: str, value: Any) -> None:
-        """Set a setting value and save."""
+        """Set a setting value and schedule a save."""
         with self._lock:
             self._settings[key] = value
-            self._save_unlocked()
+            self._version += 1
+            if key == "cameras":
+                self._refresh_cameras_unlocked()
+        self._dirty.set()
 
     def get_all(self) -> dict[str, Any]:
         """Get all settings."""
@@ -111,13 +223,37 @@ class Settings:
             return self._settings.copy()
 
     def update(self, settings: dict[str, Any]) -> None:
-        """Update multiple settings and save."""
+        """Update multiple settings and schedule a save."""
         with self._lock:
             self._settings.update(settings)
-            self._save_unlocked()
+            self._version += 1
+            if "cameras" in settings:
+                self._refresh_cameras_unlocked()
+        self._dirty.set()
 
     def reset(self) -> None:
         """Reset to default settings."""
         with self._lock:
             self._settings = DEFAULT_SETTINGS.copy()
-            self._save_unlocked()
+            self._version += 1
+            self._refresh_cameras_unlocked()
+        self._dirty.set()
+
+    @property
+    def etag(self) -> str:
+        """Return an opaque tag that changes whenever any setting changes."""
+        return f"{self._token}-{self._version}"
+
+    @property
+    def camera_slots(self) -> tuple[tuple[Any, Any, bool], ...]:
+        """Return ``(slot, device, enabled)`` for each configured camera slot."""
+        return self._camera_slots
+
+    @property
+    def cameras_version(self) -> int:
+        """Return a checksum of the camera slots that changes only when they do.
+
+        Components that derive state from the camera list can compare this
+        value to decide whether their cached result is still valid.
+        """
+        return self._cameras_version
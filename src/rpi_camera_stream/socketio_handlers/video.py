@@ -1,34 +1,71 @@
 """Socket.IO video streaming namespace."""
 
 import logging
+import threading
+from dataclasses import dataclass, field
 from typing import Optional
 
-from flask import current_app
+import numpy as np
+from flask import current_app, request
 from flask_socketio import Namespace, emit
 
-from ..camera import FrameBuffer, OpenCVCamera
+from ..camera import Camera, FrameBuffer
 from ..config import QUALITY_PRESETS, H264Config
 from ..encoders import H264Encoder
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _SharedStream:
+    """One running encoder and the clients receiving its output."""
+
+    encoder: H264Encoder
+    subscribers: set[str] = field(default_factory=set)
+
+
+def _preset_room(quality: str) -> str:
+    """Socket.IO room of the clients watching a quality preset."""
+    return f"h264-{quality}"
+
+
 class VideoNamespace(Namespace):
-    """Socket.IO namespace for H.264 video streaming."""
+    """Socket.IO namespace for H.264 video streaming.
+
+    Clients asking for the same quality preset share one encoder, so the
+    encoding cost grows with the number of presets in use rather than the
+    number of viewers. New viewers start decoding at the encoder's next
+    IDR frame, which carries the SPS/PPS headers.
+
+    A single camera callback copies each frame into a buffer owned by a
+    dispatcher thread, which feeds every active encoder. The camera thread
+    does constant work per frame however many clients are streaming, and a
+    slow fan-out only drops frames instead of holding up capture.
+    """
 
     def __init__(self, namespace: str = "/video"):
         super().__init__(namespace)
-        self._encoders: dict[str, H264Encoder] = {}
-        self._frame_callbacks: dict[str, callable] = {}
+        # preset name -> shared stream, and sid -> preset name it receives
+        self._streams: dict[str, _SharedStream] = {}
+        self._client_presets: dict[str, str] = {}
+        self._lock = threading.Lock()
+        # Camera the frame callback is registered with, while any encoder runs
+        self._camera: Optional[Camera] = None
+        # Copy of the newest camera frame, reused across frames. The lock is
+        # held while the frame is written or handed to the encoders.
+        self._frame_buf: Optional[np.ndarray] = None
+        self._frame_ready = False
+        self._frame_lock = threading.Lock()
+        self._frame_event = threading.Event()
+        self._dispatch_thread: Optional[threading.Thread] = None
+        self._dispatching = False
 
     def on_connect(self):
         """Handle client connection."""
-        from flask import request
         logger.info(f"Video client connected: {request.sid}")
 
     def on_disconnect(self):
         """Handle client disconnection."""
-        from flask import request
         sid = request.sid
         logger.info(f"Video client disconnected: {sid}")
         self._stop_encoder(sid)
@@ -39,7 +76,6 @@ class VideoNamespace(Namespace):
         Args:
             data: Dict with optional 'quality' key ('low', 'medium', 'high').
         """
-        from flask import request
         sid = request.sid
 
         quality = data.get("quality", "low")
@@ -52,59 +88,173 @@ class VideoNamespace(Namespace):
 
         self._stop_encoder(sid)
 
-        def on_h264_data(data: bytes):
-            self.socketio.emit("h264_data", data, namespace=self.namespace, to=sid)
-
-        h264_config = H264Config()
-        encoder = H264Encoder(h264_config, preset, on_h264_data)
-
-        if not encoder.start():
-            emit("error", {"message": "Failed to start encoder"})
-            return
-
-        self._encoders[sid] = encoder
-
-        def frame_callback(frame):
-            if sid in self._encoders:
-                self._encoders[sid].encode_frame(frame)
-
-        self._frame_callbacks[sid] = frame_callback
-
-        camera: Optional[OpenCVCamera] = current_app.config.get("camera")
+        camera: Optional[Camera] = current_app.config.get("camera")
         if camera is None or not camera.is_running:
             emit("error", {"message": "Camera not available"})
-            self._stop_encoder(sid)
             return
 
-        camera.add_frame_callback(frame_callback)
+        if not self._join_stream(sid, quality):
+            encoder = self._start_shared_encoder(camera, quality)
+            if encoder is None:
+                emit("error", {"message": "Failed to start encoder"})
+                return
+
+            with self._lock:
+                stream = self._streams.get(quality)
+                if stream is None:
+                    self._streams[quality] = _SharedStream(encoder, {sid})
+                    self._attach_camera(camera)
+                else:
+                    # Another client started this preset meanwhile; use theirs
+                    stream.subscribers.add(sid)
+                self._client_presets[sid] = quality
+            if stream is not None:
+                encoder.stop()
 
         emit("stream_started", {
             "width": preset.width,
             "height": preset.height,
             "fps": preset.fps,
         })
+        # Joined only now so stream_started reaches the client before any data
+        self._enter_room(sid, quality)
 
     def on_stop_stream(self, data: dict = None):
         """Handle stop_stream event from client."""
-        from flask import request
         sid = request.sid
         logger.info(f"Stopping stream for {sid}")
         self._stop_encoder(sid)
         emit("stream_stopped", {})
 
+    def _join_stream(self, sid: str, quality: str) -> bool:
+        """Subscribe a client to the running encoder for a preset, if any."""
+        with self._lock:
+            stream = self._streams.get(quality)
+            if stream is None:
+                return False
+            stream.subscribers.add(sid)
+            self._client_presets[sid] = quality
+            return True
+
+    def _start_shared_encoder(self, camera: Camera, quality: str) -> Optional[H264Encoder]:
+        """Start an encoder whose output goes to a preset's subscribers."""
+
+        room = _preset_room(quality)
+
+        def on_h264_data(data: bytes):
+            stream = self._streams.get(quality)
+            if stream is None or stream.encoder is not encoder:
+                return
+            # One emit per chunk; the Socket.IO server fans it out to the room
+            self.socketio.emit("h264_data", data, namespace=self.namespace, to=room)
+
+        # Feed frames at capture resolution and let FFmpeg do the scaling
+        properties = camera.get_properties()
+        source_size = None
+        if properties.get("width") and properties.get("height"):
+            source_size = (properties["width"], properties["height"])
+
+        app_config = current_app.config.get("app_config")
+        h264_config = app_config.h264 if app_config is not None else H264Config()
+        encoder = H264Encoder(h264_config, QUALITY_PRESETS[quality], on_h264_data, source_size)
+
+        if not encoder.start():
+            return None
+        return encoder
+
     def _stop_encoder(self, sid: str) -> None:
-        """Stop and cleanup encoder for a client."""
-        if sid in self._frame_callbacks:
-            camera: Optional[OpenCVCamera] = current_app.config.get("camera")
-            if camera is not None:
-                camera.remove_frame_callback(self._frame_callbacks[sid])
-            del self._frame_callbacks[sid]
+        """Unsubscribe a client, stopping its encoder if it was the last viewer."""
+        encoder = None
+        with self._lock:
+            quality = self._client_presets.pop(sid, None)
+            stream = self._streams.get(quality)
+            if stream is not None:
+                stream.subscribers.discard(sid)
+                if not stream.subscribers:
+                    del self._streams[quality]
+                    encoder = stream.encoder
+            if not self._streams:
+                self._detach_camera()
+
+        if quality is not None:
+            self.socketio.server.leave_room(sid, _preset_room(quality), namespace=self.namespace)
+        if encoder is not None:
+            encoder.stop()
+
+    def _enter_room(self, sid: str, quality: str) -> None:
+        """Add a client to the room its preset's H.264 data is sent to."""
+        self.socketio.server.enter_room(sid, _preset_room(quality), namespace=self.namespace)
+
+    def _attach_camera(self, camera: Camera) -> None:
+        """Register the shared frame callback with the camera (lock held).
 
-        if sid in self._encoders:
-            self._encoders[sid].stop()
-            del self._encoders[sid]
+        The callback is only registered while encoders are running, since
+        some backends decode frames to BGR only while a callback exists.
+        """
+        if self._camera is camera:
+            return
+        self._detach_camera()
+        camera.add_frame_callback(self._on_frame)
+        self._camera = camera
+
+        if self._dispatch_thread is None:
+            self._dispatching = True
+            self._dispatch_thread = threading.Thread(
+                target=self._dispatch_loop, name="h264-dispatch", daemon=True
+            )
+            self._dispatch_thread.start()
+
+    def _detach_camera(self) -> None:
+        """Unregister the shared frame callback, if registered (lock held)."""
+        if self._camera is not None:
+            self._camera.remove_frame_callback(self._on_frame)
+            self._camera = None
+            with self._frame_lock:
+                self._frame_ready = False
+
+    def _on_frame(self, frame: np.ndarray) -> None:
+        """Camera thread callback: copy the frame for the dispatcher.
+
+        The camera reuses the frame's memory for later frames, so it is
+        copied before the call returns. If the dispatcher is still handing
+        out the previous copy, this frame is dropped rather than waited on.
+        """
+        if not self._frame_lock.acquire(blocking=False):
+            return
+        try:
+            buf = self._frame_buf
+            if buf is None or buf.shape != frame.shape or buf.dtype != frame.dtype:
+                buf = self._frame_buf = np.empty(frame.shape, dtype=frame.dtype)
+            np.copyto(buf, frame)
+            self._frame_ready = True
+        finally:
+            self._frame_lock.release()
+        self._frame_event.set()
+
+    def _dispatch_loop(self) -> None:
+        """Feed the newest frame to every running encoder until stopped."""
+        while self._dispatching:
+            self._frame_event.wait()
+            self._frame_event.clear()
+            with self._frame_lock:
+                if not self._frame_ready:
+                    continue
+                self._frame_ready = False
+                # encode_frame() copies, so the buffer is free again afterwards
+                for stream in tuple(self._streams.values()):
+                    try:
+                        stream.encoder.encode_frame(self._frame_buf)
+                    except Exception as e:
+                        logger.error(f"Frame dispatch error: {e}")
 
     def cleanup_all(self) -> None:
-        """Stop all encoders (for shutdown)."""
-        for sid in list(self._encoders.keys()):
+        """Stop all encoders and the dispatcher thread (for shutdown)."""
+        for sid in list(self._client_presets.keys()):
             self._stop_encoder(sid)
+
+        thread = self._dispatch_thread
+        if thread is not None:
+            self._dispatching = False
+            self._frame_event.set()
+            thread.join(timeout=1.0)
+            self._dispatch_thread = None
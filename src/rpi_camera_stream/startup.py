@@ -3,19 +3,63 @@
 import logging
 import os
 import platform
+import random
+import socket
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
-
-def fetch_rover_ip(cloud_location: str, timeout: int = 10) -> Optional[str]:
+# Result of the background rover IP fetch started by run_startup_tasks()
+_rover_ip_future: Optional[Future] = None
+
+# How long a fetched rover IP is trusted across restarts, in seconds
+ROVER_IP_TTL = 300.0
+
+# HTTP statuses worth retrying: rate limiting and transient server errors
+_RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+# Shared across calls so refreshing the rover IP, and retrying it, reuses the
+# pooled (kept alive) connection to the cloud server instead of a new TLS
+# handshake. Retrying is done by fetch_rover_ip() itself, with jittered
+# backoff, so the adapter makes a single attempt.
+_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0)
+_session = requests.Session()
+# cloud_location is user-configurable, so plain http gets the same policy
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
+
+def fetch_rover_ip(
+    cloud_location: str,
+    timeout: tuple[float, float] = (3.0, 7.0),
+    max_retries: int = 3,
+    base_delay: float = 1.0,
+    jitter: float = 0.5,
+    max_delay: float = 30.0,
+) -> Optional[str]:
     """
     Fetch the rover's public IP address from the cloud API.
 
+    Timeouts, connection errors and 429/5xx responses are retried with
+    exponential backoff: base_delay, then doubling up to max_delay, each
+    stretched by a random factor of up to 1 + jitter so rovers restarting
+    together don't retry in lockstep. Other errors are not retried.
+
     Args:
         cloud_location: Base URL of cloud server (e.g., "https://cattern.com")
-        timeout: Request timeout in seconds
+        timeout: (connect, read) timeouts in seconds. The connection must be
+            established within the first; the second bounds each wait for
+            response data, so an unreachable server fails fast while a slow
+            one still gets time to answer.
+        max_retries: Retries after the first attempt (0 disables retrying)
+        base_delay: Delay before the first retry, in seconds
+        jitter: Maximum random extra delay, as a fraction of the delay
+        max_delay: Upper bound for the un-jittered delay, in seconds
 
     Returns:
         IP address string, or None if fetch failed
@@ -26,30 +70,52 @@ def fetch_rover_ip(cloud_location: str, timeout: int = 10) -> Optional[str]:
 
     api_url = f"{cloud_location.rstrip('/')}/api/getMyIP?format=json"
 
-    try:
-        logger.info(f"Fetching public IP from {api_url}")
-        response = requests.get(api_url, timeout=timeout)
-        response.raise_for_status()
-
-        data = response.json()
-        ip_address = data.get("ip")
-
-        if ip_address:
-            logger.info(f"Successfully fetched rover IP: {ip_address}")
-            return ip_address
-        else:
-            logger.error(f"Cloud API returned no IP address: {data}")
+    for attempt in range(max_retries + 1):
+        if attempt:
+            delay = min(max_delay, base_delay * 2 ** (attempt - 1))
+            delay *= 1 + random.uniform(0, jitter)
+            logger.info(f"Retrying IP fetch in {delay:.1f}s ({attempt}/{max_retries})")
+            time.sleep(delay)
+        retries_left = attempt < max_retries
+
+        try:
+            logger.info(f"Fetching public IP from {api_url}")
+            response = _session.get(api_url, timeout=timeout)
+            if response.status_code in _RETRY_STATUSES and retries_left:
+                logger.warning(f"Cloud API returned HTTP {response.status_code}")
+                continue
+            response.raise_for_status()
+
+            data = response.json()
+            ip_address = data.get("ip")
+
+            if ip_address:
+                logger.info(f"Successfully fetched rover IP: {ip_address}")
+                return ip_address
+            else:
+                logger.error(f"Cloud API returned no IP address: {data}")
+                return None
+
+        except requests.exceptions.Timeout:
+            if retries_left:
+                logger.warning(f"Timeout fetching IP from {api_url}")
+                continue
+            logger.error(f"Timeout fetching IP from {api_url}")
+            return None
+        except requests.exceptions.ConnectionError as e:
+            if retries_left:
+                logger.warning(f"Could not reach cloud: {e}")
+                continue
+            logger.error(f"Failed to fetch IP from cloud: {e}")
+            return None
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to fetch IP from cloud: {e}")
+            return None
+        except (KeyError, ValueError) as e:
+            logger.error(f"Invalid JSON response from cloud: {e}")
             return None
 
-    except requests.exceptions.Timeout:
-        logger.error(f"Timeout fetching IP from {api_url}")
-        return None
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to fetch IP from cloud: {e}")
-        return None
-    except (KeyError, ValueError) as e:
-        logger.error(f"Invalid JSON response from cloud: {e}")
-        return None
+    return None
 
 
 def get_local_ip() -> Optional[str]:
@@ -62,21 +128,16 @@ def get_local_ip() -> Optional[str]:
     Returns:
         Local IP address string (e.g., "192.168.1.100"), or None if detection fails
     """
-    import socket
-
     try:
-        # Create a socket and connect to an external address
-        # This doesn't actually send data, just determines routing
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.settimeout(0)
-
-        # Connect to Google DNS (8.8.8.8) to determine local interface
-        # Port 80 is arbitrary - no actual connection is made
-        s.connect(('8.8.8.8', 80))
+        # Connecting a UDP socket sends nothing, it only picks the route, so
+        # no timeout is needed; the context manager closes it on errors too
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            # Connect to Google DNS (8.8.8.8) to determine local interface
+            # Port 80 is arbitrary - no actual connection is made
+            s.connect(('8.8.8.8', 80))
 
-        # Get the socket's own address
-        local_ip = s.getsockname()[0]
-        s.close()
+            # Get the socket's own address
+            local_ip = s.getsockname()[0]
 
         logger.info(f"Detected local IP: {local_ip}")
         return local_ip
@@ -176,16 +237,96 @@ def run_startup_tasks(settings) -> None:
     else:
         logger.warning("Failed to detect local LAN IP")
 
-    # Fetch rover IP from cloud
+    # Fetch rover IP from cloud in the background; the server shouldn't wait
+    # on a slow cloud endpoint before it starts accepting requests. A daemon
+    # thread rather than an executor, so a pending fetch never delays exit.
+    global _rover_ip_future
     cloud_location = settings.get("cloud_location")
-    if cloud_location:
-        rover_ip = fetch_rover_ip(cloud_location, timeout=10)
+    cached_ip = _fresh_rover_ip(settings, cloud_location)
+    if cloud_location and cached_ip:
+        # A watchdog restart or service reload shortly after the last fetch
+        # reuses that IP instead of calling the cloud again
+        settings.set("this_rover_ip", cached_ip)
+        logger.info(f"Using rover IP fetched less than {ROVER_IP_TTL:.0f}s ago: {cached_ip}")
+        _rover_ip_future = Future()
+        _rover_ip_future.set_result(cached_ip)
+    elif cloud_location:
+        _rover_ip_future = Future()
+        threading.Thread(
+            target=_update_rover_ip,
+            args=(settings, cloud_location, _rover_ip_future),
+            name="rover-ip",
+            daemon=True,
+        ).start()
+    else:
+        logger.info("No cloud_location configured, skipping IP detection")
+
+    logger.info("Startup tasks completed")
+
+
+def _update_rover_ip(settings, cloud_location: str, future: Future) -> None:
+    """Fetch the rover IP and store it in settings (background thread)."""
+    rover_ip = None
+    try:
+        rover_ip = fetch_rover_ip(cloud_location)
         if rover_ip:
-            settings.set("this_rover_ip", rover_ip)
+            store_rover_ip(settings, rover_ip, cloud_location)
             logger.info(f"Rover IP stored in settings: {rover_ip}")
         else:
             logger.warning("Failed to fetch rover IP, continuing without it")
-    else:
-        logger.info("No cloud_location configured, skipping IP detection")
+    finally:
+        future.set_result(rover_ip)
 
-    logger.info("Startup tasks completed")
+
+def store_rover_ip(settings, rover_ip: str, cloud_location: str) -> None:
+    """
+    Store a freshly fetched rover IP along with where and when it was fetched.
+
+    Args:
+        settings: Settings instance
+        rover_ip: IP address returned by the cloud API
+        cloud_location: Base URL of the cloud server that returned it
+    """
+    settings.update({
+        "this_rover_ip": rover_ip,
+        "this_rover_ip_cache": {
+            "ip": rover_ip,
+            "cloud_location": cloud_location,
+            "ts": time.time(),
+        },
+    })
+
+
+def _fresh_rover_ip(settings, cloud_location: str) -> Optional[str]:
+    """Return the stored rover IP if cloud_location fetched it within ROVER_IP_TTL."""
+    cached = settings.get("this_rover_ip_cache")
+    if not isinstance(cached, dict) or cached.get("cloud_location") != cloud_location:
+        return None
+    try:
+        age = time.time() - float(cached["ts"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    # A negative age means the clock moved back; don't trust the entry
+    if 0 <= age < ROVER_IP_TTL:
+        return cached.get("ip")
+    return None
+
+
+def wait_for_ip(timeout: Optional[float] = None) -> Optional[str]:
+    """
+    Wait for the startup rover IP fetch to finish.
+
+    Args:
+        timeout: Maximum time to wait in seconds, or None to wait until done
+
+    Returns:
+        The fetched IP address, or None if the fetch failed, is still running
+        after the timeout, or was never started (no cloud_location)
+    """
+    future = _rover_ip_future
+    if future is None:
+        return None
+    try:
+        return future.result(timeout)
+    except FutureTimeoutError:
+        return None
@@ -1,5 +1,26 @@
-"""Utility modules for camera device information."""
+"""Utility modules for camera device information, threading and scheduling."""
 
-from .device_info import CameraDeviceInfo, get_camera_info, get_display_name
+from .camera_slots import CAMERA_TYPE_NAMES, build_camera_slot_view
+from .device_info import (
+    CameraDeviceInfo,
+    clear_camera_info_cache,
+    get_camera_info,
+    get_camera_info_all,
+    get_display_name,
+    list_video_devices,
+)
+from .offload import run_blocking
+from .scheduling import tune_current_thread
 
-__all__ = ["CameraDeviceInfo", "get_camera_info", "get_display_name"]
+__all__ = [
+    "CAMERA_TYPE_NAMES",
+    "CameraDeviceInfo",
+    "build_camera_slot_view",
+    "clear_camera_info_cache",
+    "get_camera_info",
+    "get_camera_info_all",
+    "get_display_name",
+    "list_video_devices",
+    "run_blocking",
+    "tune_current_thread",
+]
@@ -0,0 +1,62 @@
+"""Camera slot view data shared by the page and API routes."""
+
+from collections.abc import Iterable, Mapping
+from typing import Any, Optional
+
+from .device_info import get_camera_info, get_display_name
+
+# Map camera type code to readable name
+CAMERA_TYPE_NAMES = {
+    "W": "Wide Angle",
+    "N": "Normal",
+    "IR": "Infrared",
+    "T": "Telephoto",
+}
+
+
+def build_camera_slot_view(
+    camera_configs: Iterable[Mapping[str, Any]],
+    active_slot: Optional[int],
+    present_snapshots: set[str],
+) -> list[dict[str, Any]]:
+    """Describe each enabled camera slot for display.
+
+    Device details come from get_camera_info(), which caches udevadm
+    results per device, so repeated calls stay cheap.
+
+    Args:
+        camera_configs: Slot entries from the "cameras" setting.
+        active_slot: Slot number of the active camera, or None.
+        present_snapshots: File names currently in the snapshots directory.
+
+    Returns:
+        One dict per enabled slot, in the order of camera_configs.
+    """
+    camera_slots = []
+    for config in camera_configs:
+        # Skip unconfigured slots
+        if not config["enabled"]:
+            continue
+
+        slot = config["slot"]
+        device_path = config["device"]
+        camera_type = config["type"]
+
+        # Query device information
+        device_info = get_camera_info(device_path)
+
+        camera_slots.append({
+            "id": slot - 1,  # 0-indexed
+            "slot": slot,
+            "name": get_display_name(device_info),
+            "device": device_path or f"Camera {slot}",
+            "type": camera_type,
+            "type_name": CAMERA_TYPE_NAMES.get(camera_type, "Normal"),
+            "exists": device_info.exists,
+            "model_id": device_info.model_id,
+            "vendor_id": device_info.vendor_id,
+            "enabled": config["enabled"],
+            "has_snapshot": f"slot{slot}_last.jpg" in present_snapshots,
+            "active": (slot == active_slot) if active_slot else False,
+        })
+    return camera_slots
@@ -3,16 +3,62 @@
 import logging
 import os
 import re
+import stat
 import subprocess
+import sys
+import time
 from dataclasses import dataclass
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# pyudev reads the udev database in-process through libudev, which saves a
+# udevadm fork/exec per query; without it udevadm is run as before.
+try:
+    import pyudev
+except ImportError:
+    pyudev = None
 
-@dataclass
+# Camera number in a device path (e.g., /dev/video0 -> 0)
+_VIDEO_NUM_RE = re.compile(r"video(\d+)")
+
+# udev property -> CameraDeviceInfo field, for the properties we use
+_FIELD_MAP = {
+    "ID_V4L_PRODUCT": "product_name",
+    "ID_MODEL": "model_name",
+    "ID_VENDOR_ID": "vendor_id",
+    "ID_MODEL_ID": "model_id",
+    "ID_PATH": "usb_path",
+}
+
+# Short ID fields shared by cameras of the same model or on the same hub;
+# interned so the cached infos hold one copy of each. Free-form names are not.
+_INTERNED_FIELDS = frozenset(("vendor_id", "model_id", "usb_path"))
+
+# The same map keyed by the raw bytes udevadm prints, so its output can be
+# parsed without decoding the properties we discard
+_FIELD_MAP_BYTES = {key.encode("ascii"): attr for key, attr in _FIELD_MAP.items()}
+
+# device_path -> (inode, mtime_ns, info) of the last successful udevadm query
+_info_cache: dict[str, tuple[int, int, "CameraDeviceInfo"]] = {}
+
+# How long one `udevadm info --export-db` snapshot is reused, in seconds
+UDEV_DB_TTL = 5.0
+
+# (monotonic time of the dump, wall-clock ns of the dump, video device infos)
+_udev_db_cache: tuple[float, int, dict[str, "CameraDeviceInfo"]] = (float("-inf"), 0, {})
+
+# How long the /dev/videoN listing is reused, in seconds; short because it
+# is what reveals a newly plugged-in camera
+DEVICE_LIST_TTL = 2.0
+
+# (monotonic time of the scan, device paths)
+_device_list_cache: tuple[float, tuple[str, ...]] = (float("-inf"), ())
+
+
+@dataclass(slots=True)
 class CameraDeviceInfo:
-    """Camera device information from udevadm."""
+    """Camera device information from udev."""
 
     device_path: str
     model_name: Optional[str] = None
@@ -26,54 +72,204 @@ class CameraDeviceInfo:
 def get_camera_info(device_path: str) -> CameraDeviceInfo:
     """Query udevadm for camera device information.
 
+    Results are cached per device node together with its inode and mtime,
+    which change when a camera is unplugged and its node recreated, so page
+    loads only fork udevadm for new or replugged devices. Whether the device
+    exists is still checked (one stat) on every call; paths that are not
+    character devices are never looked up, and failed queries are not
+    cached. The returned object may be shared between callers and must
+    not be modified.
+
     Args:
         device_path: Path to the video device (e.g., /dev/video0)
 
     Returns:
         CameraDeviceInfo with available device properties
     """
-    info = CameraDeviceInfo(device_path=device_path)
-
     # Check if device exists
-    if not os.path.exists(device_path):
+    try:
+        st = os.stat(device_path)
+    except OSError:
         logger.debug(f"Device {device_path} does not exist")
-        return info
+        _info_cache.pop(device_path, None)
+        return CameraDeviceInfo(device_path=device_path)
+
+    # Only character devices can be cameras; anything else (such as a stale
+    # regular file) has no udev entry, so skip the lookup entirely
+    if not stat.S_ISCHR(st.st_mode):
+        logger.debug(f"{device_path} is not a character device")
+        _info_cache.pop(device_path, None)
+        return CameraDeviceInfo(device_path=device_path, exists=True)
+
+    cached = _info_cache.get(device_path)
+    if cached is not None and cached[0] == st.st_ino and cached[1] == st.st_mtime_ns:
+        return cached[2]
+
+    # One udev database dump covers every camera on the page; a dump older
+    # than the device node can't describe it, so that forces a fresh one.
+    info = _udev_db_snapshot(st.st_mtime_ns).get(device_path)
+    if info is None:
+        info = _query_camera_info(device_path)
+    if info is None:
+        return CameraDeviceInfo(device_path=device_path, exists=True)
+    _info_cache[device_path] = (st.st_ino, st.st_mtime_ns, info)
+    return info
+
+
+def clear_camera_info_cache() -> None:
+    """Forget all cached udevadm results, e.g. after a hotplug event."""
+    global _udev_db_cache
+    _info_cache.clear()
+    _udev_db_cache = (float("-inf"), 0, {})
 
-    info.exists = True
+
+def get_camera_info_all() -> dict[str, CameraDeviceInfo]:
+    """Get udev information for every /dev/video* device in one udevadm call.
+
+    The result is reused for ``UDEV_DB_TTL`` seconds and must not be
+    modified.
+
+    Returns:
+        Mapping of device path to CameraDeviceInfo; empty if udevadm failed.
+    """
+    return _udev_db_snapshot(0)
+
+
+def _udev_db_snapshot(not_before_ns: int) -> dict[str, CameraDeviceInfo]:
+    """Return a cached udev dump taken no earlier than ``not_before_ns``."""
+    global _udev_db_cache
+    now = time.monotonic()
+    dumped_at, dumped_ns, infos = _udev_db_cache
+    if now - dumped_at < UDEV_DB_TTL and dumped_ns >= not_before_ns:
+        return infos
+
+    dumped_ns = time.time_ns()
+    infos = _query_all_camera_info()
+    # Failures are cached too (as empty) so callers fall back to the
+    # per-device query instead of re-running the dump on every miss
+    _udev_db_cache = (now, dumped_ns, infos)
+    return infos
+
+
+def _query_all_camera_info() -> dict[str, CameraDeviceInfo]:
+    """Dump the udev database and parse the video devices in it."""
+    if pyudev is not None:
+        return _pyudev_all_camera_info()
+
+    try:
+        result = subprocess.run(
+            ["udevadm", "info", "--export-db"],
+            capture_output=True,
+            timeout=2.0,
+        )
+    except (subprocess.TimeoutExpired, OSError) as e:
+        logger.warning(f"udevadm database dump failed: {e}")
+        return {}
+
+    if result.returncode != 0:
+        logger.warning(f"udevadm database dump failed: {_decode(result.stderr).strip()}")
+        return {}
+
+    # Devices are blocks separated by blank lines; properties are "E: KEY=VALUE"
+    infos = {}
+    properties: list[bytes] = []
+    for line in result.stdout.splitlines():
+        if line.startswith(b"E: "):
+            properties.append(line[3:])
+        elif not line:
+            _add_video_device(infos, properties)
+            properties = []
+    _add_video_device(infos, properties)
+    return infos
+
+
+def _add_video_device(infos: dict[str, CameraDeviceInfo], properties: list[bytes]) -> None:
+    """Parse one udev database block into ``infos`` if it is a video device."""
+    for prop in properties:
+        if prop.startswith(b"DEVNAME=/dev/video"):
+            device_path = _decode(prop[len(b"DEVNAME="):])
+            break
+    else:
+        return
+
+    info = CameraDeviceInfo(device_path=device_path, exists=True)
+    for prop in properties:
+        key, _, value = prop.partition(b"=")
+        attr = _FIELD_MAP_BYTES.get(key)
+        if attr is not None:
+            _set_field(info, attr, _decode(value))
+    infos[device_path] = info
+
+
+def _pyudev_all_camera_info() -> dict[str, CameraDeviceInfo]:
+    """Read every /dev/video* device from the udev database via libudev."""
+    infos = {}
+    try:
+        for device in pyudev.Context().list_devices(subsystem="video4linux"):
+            device_path = device.device_node
+            if device_path and device_path.startswith("/dev/video"):
+                infos[device_path] = _info_from_properties(device_path, device.properties)
+    except Exception as e:
+        logger.warning(f"libudev device enumeration failed: {e}")
+        return {}
+    return infos
+
+
+def _pyudev_camera_info(device_path: str) -> Optional[CameraDeviceInfo]:
+    """Read one device's properties from the udev database via libudev."""
+    try:
+        device = pyudev.Devices.from_device_file(pyudev.Context(), device_path)
+        return _info_from_properties(device_path, device.properties)
+    except Exception as e:
+        logger.error(f"Error querying device info for {device_path}: {e}")
+        return None
+
+
+def _info_from_properties(device_path: str, properties) -> CameraDeviceInfo:
+    """Build device info from a pyudev properties mapping."""
+    info = CameraDeviceInfo(device_path=device_path, exists=True)
+    for key, attr in _FIELD_MAP.items():
+        value = properties.get(key)
+        if value is not None:
+            _set_field(info, attr, value)
+    return info
+
+
+def _query_camera_info(device_path: str) -> Optional[CameraDeviceInfo]:
+    """Read the udev properties of an existing device.
+
+    Uses libudev through pyudev when installed, otherwise runs udevadm.
+
+    Returns:
+        The device info, or None if udev could not be queried.
+    """
+    if pyudev is not None:
+        return _pyudev_camera_info(device_path)
+
+    info = CameraDeviceInfo(device_path=device_path, exists=True)
 
     try:
         # Query udevadm for device properties
         result = subprocess.run(
             ["udevadm", "info", "--query=property", f"--name={device_path}"],
             capture_output=True,
-            text=True,
             timeout=2.0,
         )
 
         if result.returncode != 0:
             logger.warning(
-                f"udevadm query failed for {device_path}: {result.stderr.strip()}"
+                f"udevadm query failed for {device_path}: {_decode(result.stderr).strip()}"
             )
-            return info
+            return None
 
         # Parse output for relevant properties
         for line in result.stdout.splitlines():
-            line = line.strip()
-            if not line or "=" not in line:
+            key, sep, value = line.partition(b"=")
+            if not sep:
                 continue
-
-            key, _, value = line.partition("=")
-
-            if key == "ID_V4L_PRODUCT":
-                info.product_name = value
-            elif key == "ID_MODEL":
-                info.model_name = value
-            elif key == "ID_VENDOR_ID":
-                info.vendor_id = value
-            elif key == "ID_MODEL_ID":
-                info.model_id = value
-            elif key == "ID_PATH":
-                info.usb_path = value
+            attr = _FIELD_MAP_BYTES.get(key)
+            if attr is not None:
+                _set_field(info, attr, _decode(value))
 
         logger.debug(
             f"Device {device_path}: product={info.product_name}, "
@@ -83,16 +279,56 @@ def get_camera_info(device_path: str) -> CameraDeviceInfo:
 
     except subprocess.TimeoutExpired:
         logger.error(f"udevadm query timed out for {device_path}")
+        return None
     except FileNotFoundError:
         logger.error(
             "udevadm command not found. Install with: sudo apt-get install udev"
         )
+        return None
     except Exception as e:
         logger.error(f"Error querying device info for {device_path}: {e}")
+        return None
 
     return info
 
 
+def _set_field(info: CameraDeviceInfo, attr: str, value: str) -> None:
+    """Store a udev property value in ``info``, interning the short ID fields."""
+    if attr in _INTERNED_FIELDS:
+        value = sys.intern(value)
+    setattr(info, attr, value)
+
+
+def _decode(value: bytes) -> str:
+    """Decode udevadm output; product names may be UTF-8, everything else ASCII."""
+    return value.decode("utf-8", "replace")
+
+
+def list_video_devices() -> tuple[str, ...]:
+    """List /dev/videoN device paths, sorted by N.
+
+    Uses a single /dev directory scan, reused for ``DEVICE_LIST_TTL`` seconds.
+
+    Returns:
+        Tuple of device paths (e.g., ("/dev/video0", "/dev/video2")).
+    """
+    global _device_list_cache
+    now = time.monotonic()
+    scanned_at, devices = _device_list_cache
+    if now - scanned_at < DEVICE_LIST_TTL:
+        return devices
+
+    with os.scandir("/dev") as entries:
+        indices = sorted(
+            int(entry.name[5:])
+            for entry in entries
+            if entry.name.startswith("video") and entry.name[5:].isdigit()
+        )
+    devices = tuple(f"/dev/video{i}" for i in indices)
+    _device_list_cache = (now, devices)
+    return devices
+
+
 def get_display_name(device_info: CameraDeviceInfo) -> str:
     """Get human-readable display name for a camera device.
 
@@ -123,7 +359,7 @@ def get_display_name(device_info: CameraDeviceInfo) -> str:
 
     # Fallback to generic name based on device path
     # Extract camera number from path (e.g., /dev/video0 -> Camera 0)
-    match = re.search(r"video(\d+)", device_info.device_path)
+    match = _VIDEO_NUM_RE.search(device_info.device_path)
     if match:
         camera_num = match.group(1)
         return f"Camera {camera_num}"
@@ -0,0 +1,64 @@
+"""Run CPU-heavy calls without stalling green-thread servers."""
+
+import functools
+import sys
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@functools.lru_cache(maxsize=1)
+def _offloader() -> Optional[Callable[..., Any]]:
+    """Return the native thread pool runner of a monkey-patched server, if any.
+
+    Monkey patching happens in __main__ before the app is imported, so the
+    answer never changes once a request has been served.
+    """
+    if "eventlet" in sys.modules:
+        from eventlet import patcher
+
+        if patcher.is_monkey_patched("thread"):
+            from eventlet import tpool
+
+            return tpool.execute
+
+    if "gevent" in sys.modules:
+        from gevent import monkey
+
+        if monkey.is_module_patched("threading"):
+            import gevent
+
+            return lambda func, *args: gevent.get_hub().threadpool.apply(func, args)
+
+    return None
+
+
+def green_threads_active() -> bool:
+    """Return True if eventlet or gevent has monkey-patched threading.
+
+    threading.Thread then starts green threads that all share the server's
+    one OS thread.
+    """
+    return _offloader() is not None
+
+
+def run_blocking(func: Callable[..., T], *args: Any) -> T:
+    """Call a GIL-releasing, CPU-heavy function such as a JPEG encode.
+
+    Under eventlet or gevent every request shares one OS thread, so a
+    multi-millisecond encode would stall all other clients; the call is run
+    on the hub's native thread pool instead and only this greenlet waits.
+    In threading mode each request already has its own OS thread and the
+    call runs inline.
+
+    Args:
+        func: Function to call.
+        *args: Positional arguments for func.
+
+    Returns:
+        Whatever func returns.
+    """
+    offload = _offloader()
+    if offload is None:
+        return func(*args)
+    return offload(func, *args)
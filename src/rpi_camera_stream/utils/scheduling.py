@@ -0,0 +1,63 @@
+"""CPU affinity and scheduling priority helpers for latency-sensitive threads."""
+
+import logging
+import os
+import threading
+from typing import Optional
+
+from .offload import green_threads_active
+
+logger = logging.getLogger(__name__)
+
+
+def tune_current_thread(
+    cpu: Optional[int] = None,
+    realtime_priority: Optional[int] = None,
+    nice: Optional[int] = None,
+) -> None:
+    """Pin the calling thread to a CPU and/or raise its scheduling priority.
+
+    On Linux all settings apply to the calling thread only. Failures (e.g.
+    missing CAP_SYS_NICE for SCHED_FIFO or a negative nice value, or a CPU
+    index that is negative or does not exist) are logged and otherwise
+    ignored so the thread keeps running with defaults.
+
+    Under eventlet or gevent every thread is a green thread on the server's
+    single OS thread, so nothing is changed: the settings would apply to the
+    whole server.
+
+    Args:
+        cpu: CPU index to pin the thread to, or None to leave affinity alone.
+        realtime_priority: SCHED_FIFO priority (1-99), or None to keep the
+            default scheduler.
+        nice: Nice value (-20 to 19) for the thread under the default
+            scheduler, or None to leave it alone.
+    """
+    name = threading.current_thread().name
+    if (cpu, realtime_priority, nice) == (None, None, None):
+        return
+    if green_threads_active():
+        logger.warning(f"Not tuning green thread {name}; it shares the server's OS thread")
+        return
+    tid = threading.get_native_id()
+
+    if cpu is not None and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(tid, {cpu})
+            logger.info(f"Pinned thread {name} to CPU {cpu}")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not pin thread {name} to CPU {cpu}: {e}")
+
+    if realtime_priority is not None and hasattr(os, "SCHED_FIFO"):
+        try:
+            os.sched_setscheduler(tid, os.SCHED_FIFO, os.sched_param(realtime_priority))
+            logger.info(f"Thread {name} running SCHED_FIFO priority {realtime_priority}")
+        except OSError as e:
+            logger.warning(f"Could not set SCHED_FIFO for thread {name}: {e}")
+
+    if nice is not None and hasattr(os, "setpriority"):
+        try:
+            os.setpriority(os.PRIO_PROCESS, tid, nice)
+            logger.info(f"Thread {name} running at nice {nice}")
+        except OSError as e:
+            logger.warning(f"Could not set nice {nice} for thread {name}: {e}")
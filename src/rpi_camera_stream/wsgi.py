@@ -0,0 +1,29 @@
+"""WSGI entry point for running the server under gunicorn.
+
+Threading mode is the default Socket.IO async mode, and its built-in server
+(Werkzeug) is only meant for development. In production, serve this module
+from a single gunicorn worker with a thread pool; Socket.IO's WebSocket
+transport then runs on simple-websocket:
+
+    gunicorn --worker-class gthread --workers 1 --threads 100 \\
+        --bind 0.0.0.0:5000 rpi_camera_stream.wsgi:app
+
+Exactly one worker must be used: the camera can only be opened once, and
+Socket.IO sessions live in the worker's memory.
+"""
+
+import atexit
+import logging
+
+from .app import create_app, start_capture, stop_capture
+from .config import Config
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+
+config = Config()
+app = create_app(config)
+start_capture(app, config)
+atexit.register(stop_capture, app, config)